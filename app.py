@@ -8,20 +8,27 @@ warnings.filterwarnings("ignore", category=DeprecationWarning)
 import logging
 logging.getLogger("paramiko").setLevel(logging.WARNING)
 
+import queue
+import threading
+from datetime import date
+
 import requests
+from requests.adapters import HTTPAdapter
 from flask import Flask, render_template, Response, jsonify
-from flask_socketio import SocketIO
+from flask_socketio import SocketIO, emit
 
-from utilities.config import RASPBERRY_PI_IP, SSH_USERNAME, SSH_PASSWORD, FILE_STATUS
+from utilities.config import RASPBERRY_PI_IP, SSH_USERNAME, SSH_PASSWORD
 from utilities.network_utils import run_pi_ssh_command
 
 from modules.weather_module import WeatherForecast
-from modules.solar_module import SolarPosition
 from modules import file_module
 
 from modules.server_module import IndigoRemoteServer
 from modules.server_module import indigo_client, start_indigo_client
+from utilities import logger
 from utilities.logger import emit_log, set_socketio as set_log_socketio, get_log_history
+from utilities import emit_queue
+from utilities import json_utils
 
 from modules.nstep_module import NStepFocuser, set_socketio as set_nstep_socketio
 from modules.mount_module import MountControl, set_socketio as set_mount_socketio
@@ -31,12 +38,14 @@ from modules import arduino_module
 
 # === App Init ===
 app = Flask(__name__)
-socketio = SocketIO(app, cors_allowed_origins="*")
+# orjson-backed packet (de)serialization for every emit
+socketio = SocketIO(app, cors_allowed_origins="*", json=json_utils)
 set_log_socketio(socketio)
+emit_queue.set_socketio(socketio)
 
 # === Module Instances ===
 weather_forecast = WeatherForecast()
-solar_calculator = SolarPosition()
+solar_calculator = solar_module.solar_position
 solar_module.set_socketio(socketio)
 
 indigo = IndigoRemoteServer(RASPBERRY_PI_IP, SSH_USERNAME, SSH_PASSWORD)
@@ -59,6 +68,22 @@ set_guider_socketio(socketio)
 set_mount_socketio(socketio)
 arduino_module.set_socketio(socketio)
 
+# Device commands run off the socket handlers but strictly in arrival order,
+# so a slew start never lands after the stop that ends it and slider
+# updates can't overtake each other.
+def _run_ordered(cmd_queue, tag):
+    while True:
+        fn, args = cmd_queue.get()
+        try:
+            fn(*args)
+        except Exception as e:
+            emit_log(f"[{tag}] Command failed: {e}")
+
+_mount_cmds = queue.Queue()
+_arduino_cmds = queue.Queue()
+threading.Thread(target=_run_ordered, args=(_mount_cmds, "MOUNT"), daemon=True).start()
+threading.Thread(target=_run_ordered, args=(_arduino_cmds, "ARDUINO"), daemon=True).start()
+
 # === Routes ===
 # Main Web Page
 @app.route('/')
@@ -67,18 +92,21 @@ def index():
 
 @socketio.on("connect")
 def send_log_history():
-    for msg in get_log_history():
-        socketio.emit("server_log", msg)
+    # New client: let the next flush re-send current state even if unchanged
+    emit_queue.forget()
+    # Whole backlog in one frame, to the connecting client only
+    emit("server_log_history", get_log_history())
+    logger.client_connected()
+
+@socketio.on("disconnect")
+def on_client_disconnect():
+    logger.client_disconnected()
 
 # File Handlers
 @app.route("/get_file_list")
 def get_file_list_route():
-    files = file_module.get_file_list()
-
-    # Inject live status for frontend coloring (optional if already included)
-    for f in files:
-        f["status"] = FILE_STATUS.get(f["name"], "Copied")
-    return jsonify(files)
+    # Entries already carry their live status
+    return jsonify(file_module.get_file_list())
 
 
 # === WebSocket Handlers ===
@@ -86,33 +114,35 @@ def get_file_list_route():
 # === Weather Handlers ===
 @socketio.on('get_weather')
 def send_weather_now():
-    socketio.emit("update_weather", weather_forecast.get_data())
+    emit("update_weather", weather_forecast.get_data())  # reply to the asking client only
 
 
 # === Solar Handlers ===
 @socketio.on('get_solar')
 def send_solar_now():
     # Sends current solar az/alt
-    socketio.emit("update_solar", solar_calculator.get_data())
+    emit("update_solar", solar_calculator.get_data())
 
-@socketio.on("get_mount_solar_state")
-def handle_get_mount_solar_state():
-    solar_coords = solar_calculator.get_solar_equatorial()
-    mount_coords = mount.get_coordinates()  # assumes mount module supports this
-    socketio.emit("mount_solar_state", {
-        **solar_coords,
-        **mount_coords
-    })
+# The arc only changes once a day, so keep the list and its serialized form together
+_path_cache = None  # (date, path list, JSON bytes)
+
+def _solar_path_today():
+    global _path_cache
+    today = date.today()
+    if _path_cache is None or _path_cache[0] != today:
+        path = solar_calculator.get_full_day_path()
+        if not path:  # generation failed; don't pin an empty arc for the day
+            return today, path, json_utils.dumps_bytes(path)
+        _path_cache = (today, path, json_utils.dumps_bytes(path))
+    return _path_cache
 
 @socketio.on("get_solar_path")
 def handle_get_solar_path():
-    path = solar_calculator.get_full_day_path()  # internally cached now
-    socketio.emit("solar_path_data", path)
+    socketio.emit("solar_path_data", _solar_path_today()[1])
 
 @app.route("/get_solar_path")
 def get_solar_path():
-    path = solar_calculator.get_full_day_path()  # internally cached now
-    return jsonify(path)
+    return Response(_solar_path_today()[2], mimetype='application/json')
 
 
 # === INDIGO Server Handlers ===
@@ -138,7 +168,7 @@ def handle_check_indigo_status():
 @socketio.on("get_mount_coordinates")
 def handle_get_mount_coordinates():
     coords = mount.get_coordinates()
-    socketio.emit("mount_coordinates", coords)
+    emit("mount_coordinates", coords)
 
 @socketio.on("get_mount_solar_state")
 def handle_get_mount_solar_state():
@@ -156,31 +186,31 @@ def handle_get_mount_status():
 
 @socketio.on("slew_mount")
 def handle_slew_mount(data):
-    mount.slew(data["direction"], data.get("rate", "solar"))
+    _mount_cmds.put((mount.slew, (data["direction"], data.get("rate", "solar"))))
 
 @socketio.on("nudge_mount")
 def handle_nudge_mount(data):
-    mount.nudge(
+    _mount_cmds.put((mount.nudge, (
         data.get("direction"),
         int(data.get("ms", 200)),
         data.get("rate", "solar"),
-    )
+    )))
 
 @socketio.on("stop_mount")
 def handle_stop_mount():
-    mount.stop()
+    _mount_cmds.put((mount.stop, ()))
 
 @socketio.on("track_sun")
 def handle_track_sun():
-    mount.track_sun()
+    _mount_cmds.put((mount.track_sun, ()))
 
 @socketio.on("park_mount")
 def handle_park_mount():
-    mount.park()
+    _mount_cmds.put((mount.park, ()))
 
 @socketio.on("unpark_mount")
 def handle_unpark_mount():
-    mount.unpark()
+    _mount_cmds.put((mount.unpark, ()))
 
 # === Autoguider Handlers ===
 @socketio.on("autoguider_start")
@@ -207,7 +237,9 @@ def handle_get_nstep_position():
 # === Arduino Handlers ===
 @socketio.on('set_dome')
 def handle_set_dome(data):
-    state_cmd = data.get("state")  # should be "open" or "close"
+    _arduino_cmds.put((_do_set_dome, (data.get("state"),)))  # should be "open" or "close"
+
+def _do_set_dome(state_cmd):
     if state_cmd and arduino_module.set_dome(state_cmd):
         emit_log("dome_state", arduino_module.get_dome())
     else:
@@ -217,6 +249,9 @@ def handle_set_dome(data):
 def handle_set_etalon(data):
     index = int(data.get("index", 0))
     value = int(data.get("value", 90))
+    _arduino_cmds.put((_do_set_etalon, (index, value)))
+
+def _do_set_etalon(index, value):
     if arduino_module.set_etalon(index, value):
         socketio.emit("etalon_position", {
             "index": index,
@@ -228,13 +263,16 @@ def handle_set_etalon(data):
 @socketio.on('get_arduino_state')
 def handle_get_arduino_state():
     state = arduino_module.get_state()
-    socketio.emit("arduino_state", state)
+    emit("arduino_state", state)
 
 # === Science Camera Handlers ===
 preview_running = False  # Global state
 
 @socketio.on("start_fc_preview")
 def handle_start_fc_preview():
+    socketio.start_background_task(_do_start_fc_preview)
+
+def _do_start_fc_preview():
     global preview_running
     emit_log("[FireCapture] ✅ Preview and HTTP server started.")
     try:
@@ -246,6 +284,9 @@ def handle_start_fc_preview():
 
 @socketio.on("stop_fc_preview")
 def handle_stop_fc_preview():
+    socketio.start_background_task(_do_stop_fc_preview)
+
+def _do_stop_fc_preview():
     global preview_running
     emit_log("[FireCapture] 🛑 Stopping preview and HTTP server...")
     if not preview_running:
@@ -259,6 +300,9 @@ def handle_stop_fc_preview():
 
 @socketio.on("trigger_fc_capture")
 def handle_fc_capture():
+    socketio.start_background_task(_do_fc_capture)
+
+def _do_fc_capture():
     try:
         run_pi_ssh_command("cd /home/pi/fc_capture && DISPLAY=:0 ./trigger_fc_script.sh")
         emit_log("📸 [FireCapture] Capture triggered.")
@@ -270,12 +314,16 @@ def handle_get_fc_status():
     socketio.emit("fc_preview_status", preview_running)
 
 # === Dome Camera Handler ===
+# Keep-alive session so repeated pings reuse one connection to the Pi
+_dome_session = requests.Session()
+_dome_session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=1))
+
 @app.route("/ping_dome_status")
 def ping_dome_status():
     try:
         ip = RASPBERRY_PI_IP
         url = f"http://{ip}:8080/"
-        resp = requests.get(url, timeout=2)
+        resp = _dome_session.head(url, timeout=2)  # only the status code matters
         if resp.status_code == 200:
             return Response("OK", status=200)
         return Response("Unavailable", status=503)
@@ -1,11 +1,13 @@
 # Arduino Module
 # Central Arduino controller for UI interaction using TCP client
 
+import re
 import threading
 import time
 import socket
 from utilities import config
 from utilities.config import RASPBERRY_PI_IP
+from utilities.emit_queue import queue_emit
 from utilities.logger import emit_log
 
 # === Arduino State (from config) ===
@@ -13,6 +15,9 @@ state = config.ARDUINO_STATE
 
 _socketio = None
 
+# One pass over the raw `status` reply: b"dome:180\net1:90\net2:95"
+_STATUS_RE = re.compile(rb'(dome|et1|et2):(-?\d+)')
+
 def set_socketio(sio):
     global _socketio
     _socketio = sio
@@ -31,6 +36,11 @@ class ArduinoTCPClient:
         self.max_log_interval = 15  # seconds
         self.max_warns = 3
         self.warn_sent = False
+        # Reused receive buffer; replies are decoded once a full line is in
+        self._rbuf = bytearray(4096)
+        self._rview = memoryview(self._rbuf)
+        self._rlen = 0  # unterminated tail kept at the front of _rbuf for the next reply
+        self._shutdown = threading.Event()
         self.watcher_thread = threading.Thread(target=self._idle_watcher, daemon=True)
         self.watcher_thread.start()
 
@@ -42,6 +52,7 @@ class ArduinoTCPClient:
             if self.sock:
                 self.sock.close()
             self.sock = socket.create_connection((self.host, self.port), timeout=3)
+            self._rlen = 0  # any tail belonged to the old connection
             state["connected"] = True
             self.fail_count = 0
             self.warn_sent = False
@@ -65,35 +76,50 @@ class ArduinoTCPClient:
             self.sock = None
 
     def send(self, message: str) -> str:
+        return self.send_raw(message).decode().strip()
+
+    def send_raw(self, message: str) -> bytes:
+        """Send a command and return the undecoded reply (b"" on failure)."""
         with self.lock:
             try:
                 if not self.sock:
                     self._connect()
                     if not self.sock:
-                        return ""
+                        return b""
                 self.sock.sendall((message + '\n').encode())
 
-                buffer = ""
-                while True:
-                    data = self.sock.recv(1024).decode()
-                    if not data:
-                        raise ConnectionError("Connection closed by server")
-                    buffer += data
-                    if '\n' in buffer:
-                        break
+                reply = self._read_reply()
                 self.last_used = time.time()
                 state["connected"] = True
-                return buffer.strip()
+                return reply
 
             except Exception as e:
                 state["connected"] = False
                 emit_log(f"[ARDUINO-TCP] Send failed: {e}")
                 self.sock = None
-                return ""
+                return b""
 
-    def _idle_watcher(self):
+    def _read_reply(self) -> bytes:
+        """Read until a newline arrives; returns every complete line received so far.
+        Bytes after the last newline start the next reply and stay buffered for it."""
+        pos = self._rlen
         while True:
-            time.sleep(5)
+            if pos == len(self._rbuf):
+                raise ConnectionError("Reply exceeds receive buffer")
+            n = self.sock.recv_into(self._rview[pos:])
+            if not n:
+                raise ConnectionError("Connection closed by server")
+            nl = self._rbuf.rfind(b'\n', pos, pos + n)
+            pos += n
+            if nl >= 0:
+                reply = bytes(self._rbuf[:nl])
+                self._rlen = pos - nl - 1
+                self._rbuf[:self._rlen] = self._rbuf[nl + 1:pos]
+                return reply
+
+    def _idle_watcher(self):
+        # Wakes once per idle_timeout (or immediately on close) instead of every 5 s
+        while not self._shutdown.wait(self.idle_timeout):
             with self.lock:
                 if self.sock and (time.time() - self.last_used > self.idle_timeout):
                     try:
@@ -103,6 +129,17 @@ class ArduinoTCPClient:
                         pass
                     self.sock = None
 
+    def close(self):
+        """Stop the idle watcher and drop the socket."""
+        self._shutdown.set()
+        with self.lock:
+            if self.sock:
+                try:
+                    self.sock.close()
+                except:
+                    pass
+                self.sock = None
+
 # Persistent client instance
 _client = ArduinoTCPClient()
 
@@ -112,7 +149,7 @@ def set_dome(state_cmd: str) -> bool:
     if state_cmd not in ("open", "close"):
         return False
     res = _send(f"dome {'180' if state_cmd == 'open' else '0'}")
-    if res.startswith("dome:"):
+    if _reply_key(res) == "dome":
         state["dome"] = state_cmd.upper()
         _update()
         return True
@@ -122,7 +159,7 @@ def set_etalon(index: int, value: int) -> bool:
     if index not in (1, 2) or not (0 <= value <= 180):
         return False
     res = _send(f"et{index} {value}")
-    if res.startswith(f"et{index}:"):
+    if _reply_key(res) == f"et{index}":
         state[f"etalon{index}"] = value
         _update()
         return True
@@ -167,34 +204,41 @@ def _poll_loop(interval):
                 continue
 
         try:
-            dome = _send("status").strip()
-            for line in dome.split("\n"):
-                if line.startswith("dome:"):
-                    dome_pos = int(line.split(":")[1])
-                    state["dome_raw"] = dome_pos
-                    if dome_pos >= 170:
-                        state["dome"] = "OPEN"
-                    elif dome_pos <= 10:
-                        state["dome"] = "CLOSED"
-                    else:
-                        state["dome"] = f"Moving ({dome_pos}°)"
-                elif line.startswith("et1:"):
-                    state["etalon1"] = int(line.split(":")[1])
-                elif line.startswith("et2:"):
-                    state["etalon2"] = int(line.split(":")[1])
+            reply = _client.send_raw("status")
+            for m in _STATUS_RE.finditer(reply):
+                _STATUS_APPLY[m.group(1)](int(m.group(2)))
             _update()
         except Exception as e:
             emit_log(f"[Arduino Monitor Error] {e}")
             state["connected"] = False
         time.sleep(interval)
 
+def _apply_dome(pos: int):
+    state["dome_raw"] = pos
+    if pos >= 170:
+        state["dome"] = "OPEN"
+    elif pos <= 10:
+        state["dome"] = "CLOSED"
+    else:
+        state["dome"] = f"Moving ({pos}°)"
+
+def _apply_et1(value: int):
+    state["etalon1"] = value
+
+def _apply_et2(value: int):
+    state["etalon2"] = value
+
+_STATUS_APPLY = {b"dome": _apply_dome, b"et1": _apply_et1, b"et2": _apply_et2}
+
+def _reply_key(reply: str) -> str:
+    # "et1:90" -> "et1"; a single C-level scan instead of prefix checks
+    return reply.partition(":")[0]
+
 def _send(cmd: str) -> str:
     return _client.send(cmd)
 
 def _update():
     state['last_updated'] = time.strftime("%Y-%m-%d %H:%M:%S")
-    if _socketio:
-        try:
-            _socketio.emit("arduino_state", state)
-        except Exception as e:
-            emit_log(f"[Emit Error] Failed to emit Arduino state: {e}")
\ No newline at end of file
+    # Coalesced + deduplicated; an unchanged poll tick sends nothing. The live dict
+    # is staged as-is: the flush serializes whatever is current at send time.
+    queue_emit("arduino_state", state, volatile=("last_updated",))
\ No newline at end of file
@@ -2,17 +2,33 @@
 # Monitors and copies files from a watched directory to a destination directory
 
 import os
+import shutil
 import time
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 import smbclient
-from utilities.config import FILE_WATCH_DIR, FILE_DEST_DIR, FILE_STATUS, RASPBERRY_PI_IP, SSH_USERNAME, SSH_PASSWORD
+try:
+    from smbclient._io import SMBDirectoryIO  # private, but smbclient has no public directory handle
+    from smbprotocol.change_notify import ChangeNotifyFlags, CompletionFilter, FileSystemWatcher
+except ImportError:  # older smbprotocol: fall back to plain polling
+    FileSystemWatcher = None
+from utilities.config import FILE_WATCH_DIR, FILE_DEST_DIR, FILE_STATUS, FILE_INDEX, RASPBERRY_PI_IP, SSH_USERNAME, SSH_PASSWORD
+from utilities.emit_queue import queue_emit
 from utilities.logger import emit_log
 
 STABILITY_CHECK_TIME = 3  # Seconds
+COPY_CHUNK_SIZE = 1 << 20  # 1 MiB
+BASE_EXISTS_TTL = 30  # Seconds a positive share check is trusted
+NOTIFY_WAIT_INTERVALS = 6  # change-notify waits are capped at this many poll intervals
+
+# Two workers let one file's network read overlap another's disk write
+_copy_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="filecopy")
 
 socketio = None
+_index_loaded = False  # FILE_INDEX seeded from FILE_DEST_DIR yet?
+
 def set_socketio_instance(sio):
     global socketio
     socketio = sio
@@ -27,29 +43,43 @@ class FileHandler:
     def __init__(self):
         self.file_count = 0
         self.current_day = datetime.now().date()
+        # smb_path -> (size, mtime, first_seen) across poll ticks
+        self._size_history = {}
+        self._pending = False  # last scan left files still settling
+        self._base_exists_ts = 0.0
+        self._in_flight = set()  # names queued or copying in _copy_pool
 
-    def is_file_write_complete(self, filepath):
+    def is_file_write_complete(self, entry):
+        """True once size and mtime have held steady for STABILITY_CHECK_TIME across polls.
+        `entry` comes from smbclient.scandir, so its stat is served from the listing."""
+        smb_path = entry.path
         try:
-            with smbclient.open_file(filepath, mode='rb') as f:
-                initial_size = f.seek(0, os.SEEK_END)
-            time.sleep(STABILITY_CHECK_TIME)
-            with smbclient.open_file(filepath, mode='rb') as f:
-                final_size = f.seek(0, os.SEEK_END)
-            return initial_size == final_size
+            st = entry.stat()
         except Exception as e:
             emit_log(f"[FILES] File check error: {e}")
+            self._size_history.pop(smb_path, None)
             return False
 
-    def process_file(self, smb_path, filename):
-        FILE_STATUS[filename] = "Detected"
+        now = time.time()
+        prev = self._size_history.get(smb_path)
+        if prev is None or (st.st_size, st.st_mtime) != prev[:2]:
+            self._size_history[smb_path] = (st.st_size, st.st_mtime, now)
+            return False
+        return now - prev[2] >= STABILITY_CHECK_TIME
 
-        if not self.is_file_write_complete(smb_path):
-            FILE_STATUS[filename] = "Failed"
-            emit_log(f"[FILES] File still writing: {filename}")
-            self._emit_update()
+    def process_file(self, entry):
+        smb_path, filename = entry.path, entry.name
+        FILE_STATUS.setdefault(filename, "Detected")
+
+        # Not stable yet: leave as "Detected" and re-check on the next poll
+        if not self.is_file_write_complete(entry):
             return
 
-        FILE_STATUS[filename] = "Copying"
+        self._size_history.pop(smb_path, None)
+        if filename in self._in_flight:
+            return
+
+        # Folder numbering happens here on the monitor thread so it follows detection order
         now = datetime.now()
         if now.date() != self.current_day:
             self.current_day = now.date()
@@ -60,47 +90,101 @@ class FileHandler:
         time_str = now.strftime('%H%M%S')
         new_folder = f"{self.file_count}_{date_str}_{time_str}"
         new_path = os.path.join(FILE_DEST_DIR, new_folder)
-        os.makedirs(new_path, exist_ok=True)
 
+        FILE_STATUS[filename] = "Queued"
+        self._in_flight.add(filename)
+        _copy_pool.submit(self._copy_file, smb_path, filename, new_path)
+
+    def _copy_file(self, smb_path, filename, new_path):
+        FILE_STATUS[filename] = "Copying"
         dest_file = os.path.join(new_path, filename)
         try:
-            with smbclient.open_file(smb_path, mode='rb') as remote, open(dest_file, 'wb') as local:
-                local.write(remote.read())
+            os.makedirs(new_path, exist_ok=True)
+            FILE_INDEX[dest_file] = {"name": filename, "size": "0 KB",
+                                     "modified": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                                     "status": "Copying"}
+            # Stream in chunks so large AVIs never sit fully in memory
+            with smbclient.open_file(smb_path, mode='rb', buffering=COPY_CHUNK_SIZE) as remote, \
+                    open(dest_file, 'wb') as local:
+                shutil.copyfileobj(remote, local, length=COPY_CHUNK_SIZE)
             FILE_STATUS[filename] = "Copied"
+            _index_file(dest_file, "Copied")
             emit_log(f"[FILES] Copied: {filename} → {dest_file}")
             smbclient.remove(smb_path)
             emit_log(f"[FILES] Deleted original: {filename}")
         except Exception as e:
             FILE_STATUS[filename] = "Failed"
+            if dest_file in FILE_INDEX:
+                _index_file(dest_file, "Failed")
             emit_log(f"[FILES] Error copying {filename}: {e}")
         finally:
+            self._in_flight.discard(filename)
             self._emit_update()
 
     def _emit_update(self):
-        if socketio:
-            try:
-                socketio.emit("file_list_update", FileHandler.get_file_list(), broadcast=True)
-            except Exception as e:
-                emit_log(f"[FILES] Emit error: {e}")
+        try:
+            queue_emit("file_list_update", FileHandler.get_file_list())
+        except Exception as e:
+            emit_log(f"[FILES] Emit error: {e}")
 
-    def check_directory(self):
+    @staticmethod
+    def _watch_paths():
         base_share = FILE_WATCH_DIR
         base_path = f"\\\\{RASPBERRY_PI_IP}\\{base_share}"
         today_str = datetime.now().strftime('%m%d%y')
-        smb_today = base_path + "\\" + today_str
+        return base_path, base_path + "\\" + today_str
 
-        if not smbclient.path.exists(base_path):
-            emit_log(f"[FILES] ❌ Base watch directory missing: {base_path}")
-            if socketio:
-                socketio.emit("file_watch_status", {"status": "disconnected"})
-            return
-        else:
-            if socketio:
-                socketio.emit("file_watch_status", {"status": "connected"})
+    def has_pending(self):
+        """True while a file seen in the latest scan is still waiting to settle."""
+        return self._pending
 
+    def wait_for_change(self, timeout):
+        """Block until the share reports a change under the watch root (SMB2 CHANGE_NOTIFY)
+        or `timeout` seconds pass; either way the caller rescans.
+        Returns False when notifications are unavailable so the caller falls back to polling."""
+        if FileSystemWatcher is None:
+            return False
+        base_path, _ = self._watch_paths()
         try:
-            if not smbclient.path.exists(base_path):
-                if not hasattr(self, "warned_base_missing") or not self.warned_base_missing:
+            # Watch the whole tree so the new day's folder wakes us up too
+            with SMBDirectoryIO(base_path, mode='r', share_access='rwd') as dir_io:
+                watcher = FileSystemWatcher(dir_io.fd)
+                watcher.start(
+                    CompletionFilter.FILE_NOTIFY_CHANGE_FILE_NAME
+                    | CompletionFilter.FILE_NOTIFY_CHANGE_DIR_NAME
+                    | CompletionFilter.FILE_NOTIFY_CHANGE_SIZE,
+                    flags=ChangeNotifyFlags.SMB2_WATCH_TREE,
+                )
+                # Bounded: a quiet night or a half-dead session must not park the monitor
+                if not watcher.response_event.wait(timeout):
+                    watcher.cancel()
+            self.warned_notify_failed = False
+            return True
+        except Exception as e:
+            if not getattr(self, "warned_notify_failed", False):
+                emit_log(f"[FILES] Change notify unavailable, polling instead: {e}")
+                self.warned_notify_failed = True
+            return False
+
+    def _base_exists(self, base_path):
+        # Trust a positive answer for BASE_EXISTS_TTL; the share rarely comes and goes
+        now = time.time()
+        if now - self._base_exists_ts < BASE_EXISTS_TTL:
+            return True
+        exists = smbclient.path.exists(base_path)
+        self._base_exists_ts = now if exists else 0.0
+        return exists
+
+    def check_directory(self):
+        base_path, smb_today = self._watch_paths()
+        self._pending = False
+
+        try:
+            base_exists = self._base_exists(base_path)
+            queue_emit("file_watch_status", {"status": "connected" if base_exists else "disconnected"})
+
+            if not base_exists:
+                if not getattr(self, "warned_base_missing", False):
                     emit_log(f"[FILES] ❌ Base watch directory missing: {base_path}")
                     self.warned_base_missing = True
                 return
@@ -110,6 +194,7 @@ class FileHandler:
                 self.warned_base_missing = False
 
             if not smbclient.path.exists(smb_today):
+                self._size_history.clear()  # nothing left here to settle
                 if not hasattr(self, "warned_today_missing") or not self.warned_today_missing:
                     emit_log(f"[FILES] 📂 Today's folder not found: {smb_today}")
                     self.warned_today_missing = True
@@ -119,31 +204,47 @@ class FileHandler:
                     emit_log(f"[FILES] 🗂️ Found today's folder: {smb_today}")
                 self.warned_today_missing = False
 
-            for f in smbclient.listdir(smb_today):
-                if f.lower().endswith(".avi") and f not in FILE_STATUS:
-                    full_path = os.path.join(smb_today, f)
-                    self.process_file(full_path, f)
+            # One directory query returns names and sizes together
+            seen = set()
+            for entry in smbclient.scandir(smb_today):
+                name = entry.name
+                seen.add(entry.path)
+                if name.lower().endswith(".avi") and FILE_STATUS.get(name, "Detected") == "Detected":
+                    self.process_file(entry)
+
+            # Forget files that vanished (deleted, renamed, or yesterday's folder) before settling
+            for smb_path in self._size_history.keys() - seen:
+                del self._size_history[smb_path]
+            self._pending = bool(self._size_history)
 
         except Exception as e:
+            self._base_exists_ts = 0.0  # re-check the share next time
             emit_log(f"[FILES] ⚠️ SMB access error: {e}")
 
     @staticmethod
     def get_file_list():
-        file_data = []
-        for folder in os.listdir(FILE_DEST_DIR):
-            folder_path = os.path.join(FILE_DEST_DIR, folder)
-            if os.path.isdir(folder_path):
-                for f in os.listdir(folder_path):
-                    file_path = os.path.join(folder_path, f)
-                    if os.path.isfile(file_path):
-                        stats = os.stat(file_path)
-                        file_data.append({
-                            "name": f,
-                            "size": f"{stats.st_size // 1024} KB",
-                            "modified": datetime.fromtimestamp(stats.st_mtime).strftime("%Y-%m-%d %H:%M:%S"),
-                            "status": FILE_STATUS.get(f, "Copied")
-                        })
-        return file_data
+        """Served from FILE_INDEX, which the copy workers keep current."""
+        global _index_loaded
+        if not _index_loaded:
+            # First call after a restart: pick up copies made by earlier runs
+            with os.scandir(FILE_DEST_DIR) as folders:
+                for folder in folders:
+                    if not folder.is_dir():
+                        continue
+                    with os.scandir(folder.path) as entries:
+                        for entry in entries:
+                            if entry.is_file() and entry.path not in FILE_INDEX:
+                                _index_file(entry.path, FILE_STATUS.get(entry.name, "Copied"))
+            _index_loaded = True
+        return list(FILE_INDEX.values())
+
+def _index_file(path, status):
+    """Record (or refresh in place) a destination file's listing entry."""
+    stats = os.stat(path)
+    entry = FILE_INDEX.setdefault(path, {"name": os.path.basename(path)})
+    entry["size"] = f"{stats.st_size // 1024} KB"
+    entry["modified"] = datetime.fromtimestamp(stats.st_mtime).strftime("%Y-%m-%d %H:%M:%S")
+    entry["status"] = status
 
 def start_file_monitoring(interval=5, max_retries=5):
     handler = FileHandler()
@@ -161,7 +262,11 @@ def start_file_monitoring(interval=5, max_retries=5):
                 if retries >= max_retries:
                     emit_log("[FileHandler] Max retries reached. Stopping file monitor.")
                     break
-            time.sleep(interval)
+
+            # Idle: sleep on the share's change notification. Keep polling while
+            # files are settling or when notify isn't available (e.g. share down).
+            if handler.has_pending() or not handler.wait_for_change(NOTIFY_WAIT_INTERVALS * interval):
+                time.sleep(interval)
 
     thread = threading.Thread(target=monitor_loop, daemon=True)
     thread.start()
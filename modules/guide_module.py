@@ -1,8 +1,6 @@
 # guide_module.py
 # Lean centroid-based autoguider using the science-cam preview stream.
 
-import base64
-import io
 import threading
 import time
 from dataclasses import dataclass
@@ -11,6 +9,18 @@ from typing import Optional, Tuple
 import cv2
 import numpy as np
 import requests
+from requests.adapters import HTTPAdapter
+
+try:  # libjpeg-turbo's direct API, if PyTurboJPEG and the shared library are installed
+    from turbojpeg import TurboJPEG, TJSAMP_420
+    _turbo = TurboJPEG()
+except Exception:
+    _turbo = None
+
+try:  # optional: JIT the centroid scan
+    from numba import njit
+except ImportError:
+    njit = None
 
 from utilities.config import RASPBERRY_PI_IP
 from utilities.logger import emit_log
@@ -25,17 +35,66 @@ def set_socketio(instance):
     _socketio = instance
 
 
+def _weighted_centroid_np(gray: np.ndarray, thresh: int) -> Tuple[float, float, int]:
+    """Centroid of pixels above thresh, weighted by their level above it: (x, y, pixel count)."""
+    above = gray > thresh
+    n = int(np.count_nonzero(above))
+    if n == 0:
+        return 0.0, 0.0, 0
+    w = np.where(above, gray.astype(np.float32) - thresh, np.float32(0))
+    sw = float(w.sum())
+    sx = float(w.sum(axis=0) @ np.arange(w.shape[1], dtype=np.float32))
+    sy = float(w.sum(axis=1) @ np.arange(w.shape[0], dtype=np.float32))
+    return sx / sw, sy / sw, n
+
+
+if njit is not None:
+    @njit(cache=True, fastmath=True)
+    def _weighted_centroid(gray, thresh):
+        # Same result as _weighted_centroid_np in a single pass over the ROI
+        sx = 0.0
+        sy = 0.0
+        sw = 0.0
+        n = 0
+        h, w = gray.shape
+        for i in range(h):
+            for j in range(w):
+                v = float(gray[i, j]) - thresh
+                if v > 0.0:
+                    sx += j * v
+                    sy += i * v
+                    sw += v
+                    n += 1
+        if sw == 0.0:
+            return 0.0, 0.0, 0
+        return sx / sw, sy / sw, n
+else:
+    _weighted_centroid = _weighted_centroid_np
+
+
+# (scale factor, imdecode flag), largest first
+_REDUCED_GRAY = (
+    (8, cv2.IMREAD_REDUCED_GRAYSCALE_8),
+    (4, cv2.IMREAD_REDUCED_GRAYSCALE_4),
+    (2, cv2.IMREAD_REDUCED_GRAYSCALE_2),
+)
+
+
 @dataclass
 class GuiderConfig:
     # Frame source
     url: str = None  # filled from RASPBERRY_PI_IP if None
+    stream_url: str = None  # MJPEG endpoint; falls back to polling url when not served
     timeout_s: float = 1.0
     target_fps: float = 5.0
     downscale_width: int = 480  # speed + stable overlay size
 
     # Detection (bright-disk centroid)
-    blur_ksize: int = 5
+    blur_ksize: int = 5             # box blur on the ROI
+    thresh_refresh_s: float = 1.0   # how often Otsu is re-run (on a 1/4-size frame)
+    thresh_ema_alpha: float = 0.1   # weight of each new Otsu level in the running threshold
     min_contour_area: int = 80      # px; ignore speckles
+    roi_pad_px: int = 64            # search margin around the last disk; full frame when lost
     lock_radius_px: int = 8         # inside this, consider "locked"
     lock_hold_frames: int = 10      # frames required to declare/keep lock
     deadband_px: int = 5            # no corrections inside this radius
@@ -46,8 +105,10 @@ class GuiderConfig:
     max_pulse_ms: int = 600
     min_axis_interval_ms: int = 120 # refractory per-axis between pulses
 
-    # JPEG overlay quality
-    jpeg_quality: int = 70
+    # JPEG overlay quality: spend bytes while searching/correcting, save them once locked
+    jpeg_quality: int = 80
+    jpeg_quality_locked: int = 50
+    overlay_hold_s: float = 0.5     # skip overlays whose centroid moved <1 px within this window
 
 
 class AutoGuider:
@@ -56,15 +117,50 @@ class AutoGuider:
         self.cfg = config or GuiderConfig()
         if self.cfg.url is None:
             self.cfg.url = f"http://{RASPBERRY_PI_IP}:8082/fc_preview.jpg"
+        if self.cfg.stream_url is None:
+            self.cfg.stream_url = f"http://{RASPBERRY_PI_IP}:8082/fc_preview.mjpg"
 
         self._running = False
         self._thread: Optional[threading.Thread] = None
 
+        # One kept-alive connection to the Pi for every frame fetch
+        self._http = requests.Session()
+        self._http.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=2))
+        self._http.headers.update({"Connection": "keep-alive"})
+
+        # Overlay handoff to the encoder thread
+        self._encoder: Optional[threading.Thread] = None
+        self._overlay_cond = threading.Condition()
+        self._pending_overlay: Optional[Tuple[np.ndarray, int]] = None  # one-slot: encoder takes the newest
+        self._overlay_pool = []  # overlay buffers not owned by the encoder, reused frame to frame
+        self._prev_centroid: Optional[Tuple[int, int]] = None
+        self._prev_emit_ns = 0  # monotonic_ns of the last overlay sent
+
+        # Scratch buffers reused every frame via OpenCV dst= (reallocated only if the size changes)
+        self._buf_gray: Optional[np.ndarray] = None
+        self._src_width = 0  # full-resolution preview width, learned from the first decode
+        self._buf_blur: Optional[np.ndarray] = None
+        self._buf_mask: Optional[np.ndarray] = None
+
+        # Disk/sky threshold: EMA of periodic Otsu levels
+        self._thresh_level: Optional[float] = None
+        self._thresh_ns = 0  # monotonic_ns of the last Otsu run
+
+        # Latest-wins frame slot filled by the reader thread
+        self._reader: Optional[threading.Thread] = None
+        self._frame_cond = threading.Condition()
+        self._latest_jpeg: Optional[bytes] = None
+        self._latest_ts = 0.0  # monotonic arrival time of _latest_jpeg
+        self._frame_seq = 0
+        self._seen_seq = 0
+
         # status
         self._fps = 0.0
         self._locked = False
         self._lock_streak = 0
-        self._last_overlay_b64 = None
+        self._last_overlay_jpeg: Optional[bytes] = None
+        self._roi: Optional[Tuple[int, int, int, int]] = None  # x0, y0, x1, y1 of last disk + pad
+        self._proc = self._make_processor(self.cfg)  # (frame, now_ns) -> (target, dx, dy, r, found)
         self._last_status = {
             "status": "IDLE",
             "fps": "--",
@@ -75,7 +171,8 @@ class AutoGuider:
         }
 
         # per-axis refractory to avoid spamming pulses
-        self._last_pulse_time = {"ra": 0.0, "dec": 0.0}
+        self._last_pulse_ra_ns = 0   # monotonic_ns of the last pulse per axis
+        self._last_pulse_dec_ns = 0
 
     # ---------- public API ----------
 
@@ -84,9 +181,19 @@ class AutoGuider:
             emit_log("[GUIDER] already running")
             return
         self._running = True
+        self._roi = None
+        self._thresh_level = None
+        self._fps = 0.0
+        self._proc = self._make_processor(self.cfg)  # picks up any config edits since last run
         emit_log(f"[GUIDER] starting (src={self.cfg.url})")
         self._thread = threading.Thread(target=self._loop, daemon=True)
         self._thread.start()
+        if self._reader is None or not self._reader.is_alive():
+            self._reader = threading.Thread(target=self._reader_loop, daemon=True)
+            self._reader.start()
+        if self._encoder is None or not self._encoder.is_alive():
+            self._encoder = threading.Thread(target=self._encoder_loop, daemon=True)
+            self._encoder.start()
 
     def stop(self):
         self._running = False
@@ -99,19 +206,24 @@ class AutoGuider:
     # ---------- core loop ----------
 
     def _loop(self):
-        tgt_dt = 1.0 / max(0.5, float(self.cfg.target_fps))
-        t_last_fps = time.time()
-        frames = 0
+        tgt_ns = int(1e9 / max(0.5, float(self.cfg.target_fps)))
+        max_age = 2 * tgt_ns / 1e9
+        process = self._proc
+        t_last_frame = 0
+        deadline = time.monotonic_ns() + tgt_ns
 
         while self._running:
-            t0 = time.time()
+            processed = False
             try:
-                frame = self._fetch_frame()
+                # A frame older than two periods means the Pi stalled: report it, don't guide on it
+                frame = self._fetch_frame(deadline / 1e9, max_age=max_age)
                 if frame is None:
                     self._update_status("NO_FRAME", None)
                 else:
-                    overlay, dx, dy, r, found = self._process_frame(frame)
-                    self._push_overlay(overlay)
+                    processed = True
+                    t_frame = time.monotonic_ns()  # one timestamp per frame for its hold-offs
+                    target, dx, dy, r, found = process(frame, t_frame)
+                    self._push_overlay(frame, target, t_frame)
 
                     if found:
                         self._guide(dx, dy, r)
@@ -121,85 +233,216 @@ class AutoGuider:
                 emit_log(f"[GUIDER] loop error: {e}")
                 self._update_status("ERROR", None)
 
-            # fps calc
-            frames += 1
-            if time.time() - t_last_fps >= 1.0:
-                self._fps = frames / (time.time() - t_last_fps)
-                t_last_fps = time.time()
-                frames = 0
+            now = time.monotonic_ns()  # one clock read serves fps and pacing
 
-            # pace to target fps
-            dt = time.time() - t0
-            if dt < tgt_dt:
-                time.sleep(tgt_dt - dt)
+            # fps: EMA over the interval between processed frames
+            if processed:
+                if t_last_frame:
+                    inst = 1e9 / max(1, now - t_last_frame)
+                    self._fps = inst if not self._fps else 0.9 * self._fps + 0.1 * inst
+                t_last_frame = now
+
+            # pace to fixed deadlines; after an overrun restart from now rather than
+            # racing through back-to-back ticks to catch up
+            if now < deadline:
+                time.sleep((deadline - now) / 1e9)
+                deadline += tgt_ns
+            else:
+                deadline = now + tgt_ns
 
         self._update_status("IDLE", None)
         emit_log("[GUIDER] loop ended")
 
     # ---------- frame input ----------
 
-    def _fetch_frame(self) -> Optional[np.ndarray]:
-        r = requests.get(self.cfg.url, timeout=self.cfg.timeout_s)
-        if r.status_code != 200:
-            return None
-        data = np.frombuffer(r.content, dtype=np.uint8)
-        img = cv2.imdecode(data, cv2.IMREAD_COLOR)
+    def _reader_loop(self):
+        """Producer: keep only the newest JPEG from the Pi, independent of processing cadence."""
+        use_stream = True
+        while self._running:
+            try:
+                if use_stream:
+                    use_stream = self._read_stream()
+                else:
+                    self._poll_still()
+            except Exception:
+                time.sleep(self.cfg.timeout_s)  # Pi unreachable; _loop reports NO_FRAME meanwhile
+
+    def _read_stream(self) -> bool:
+        """Consume multipart/x-mixed-replace frames; False if the Pi doesn't serve the stream."""
+        # Short connect timeout so an unreachable Pi fails fast instead of stalling the reader
+        with self._http.get(self.cfg.stream_url, stream=True, timeout=(0.2, self.cfg.timeout_s)) as r:
+            if r.status_code != 200 or "multipart" not in r.headers.get("Content-Type", ""):
+                emit_log("[GUIDER] MJPEG stream unavailable; polling still frames")
+                return False
+            buf = bytearray()
+            for chunk in r.iter_content(chunk_size=16384):
+                if not self._running:
+                    break
+                buf += chunk
+                end = buf.rfind(b"\xff\xd9")  # JPEG EOI
+                if end < 0:
+                    if len(buf) > (8 << 20):  # no frame boundary in 8 MB: resync
+                        buf.clear()
+                    continue
+                start = buf.rfind(b"\xff\xd8", 0, end)  # SOI of the newest complete frame
+                if start >= 0:
+                    self._publish(bytes(buf[start:end + 2]))
+                del buf[:end + 2]
+        return True
+
+    def _poll_still(self):
+        t0 = time.time()
+        r = self._http.get(self.cfg.url, timeout=(0.2, self.cfg.timeout_s))
+        if r.status_code == 200:
+            self._publish(r.content)
+        dt = time.time() - t0
+        tgt_dt = 1.0 / max(0.5, float(self.cfg.target_fps))
+        if dt < tgt_dt:
+            time.sleep(tgt_dt - dt)
+
+    def _publish(self, jpeg: bytes):
+        with self._frame_cond:
+            self._latest_jpeg = jpeg
+            self._latest_ts = time.monotonic()
+            self._frame_seq += 1
+            self._frame_cond.notify()
+
+    def _fetch_frame(self, deadline: float, max_age: float) -> Optional[np.ndarray]:
+        """Decode the newest unseen frame, waiting no later than deadline; None if there is
+        none or it is older than max_age. Older frames were simply overwritten."""
+        with self._frame_cond:
+            if self._frame_seq == self._seen_seq:
+                self._frame_cond.wait(max(0.0, deadline - time.monotonic()))
+            if self._frame_seq == self._seen_seq:
+                return None
+            jpeg, self._seen_seq = self._latest_jpeg, self._frame_seq
+            if time.monotonic() - self._latest_ts > max_age:
+                return None
+        data = np.frombuffer(jpeg, dtype=np.uint8)
+        # Grayscale decode: only luma is needed for centroiding, libjpeg skips the chroma work.
+        # Once the source width is known, let libjpeg also drop resolution by 2/4/8 in the
+        # IDCT while staying at or above downscale_width; resize only finishes the rest.
+        factor, flag = 1, cv2.IMREAD_GRAYSCALE
+        for f, reduced in _REDUCED_GRAY:
+            if self._src_width // f >= self.cfg.downscale_width:
+                factor, flag = f, reduced
+                break
+        img = cv2.imdecode(data, flag)
         if img is None:
             return None
+        self._src_width = img.shape[1] * factor
         # downscale to fixed width
         h, w = img.shape[:2]
         if w > self.cfg.downscale_width:
             scale = self.cfg.downscale_width / float(w)
-            img = cv2.resize(img, (self.cfg.downscale_width, int(h * scale)), interpolation=cv2.INTER_AREA)
+            img = self._buf_gray = cv2.resize(img, (self.cfg.downscale_width, int(h * scale)),
+                                              dst=self._buf_gray, interpolation=cv2.INTER_AREA)
         return img
 
     # ---------- detection + overlay ----------
 
-    def _process_frame(self, frame: np.ndarray) -> Tuple[np.ndarray, Optional[float], Optional[float], Optional[float], bool]:
-        h, w = frame.shape[:2]
+    def _render_overlay(self, gray: np.ndarray, target: Optional[Tuple[int, int]]) -> np.ndarray:
+        h, w = gray.shape[:2]
         cx, cy = w // 2, h // 2
 
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        if self.cfg.blur_ksize > 1:
-            gray = cv2.GaussianBlur(gray, (self._odd(self.cfg.blur_ksize), self._odd(self.cfg.blur_ksize)), 0)
-
-        # Otsu threshold (bright disk)
-        _, mask = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-
-        # Largest contour
-        contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-        best = None
-        best_area = 0
-        for c in contours:
-            a = cv2.contourArea(c)
-            if a > best_area and a >= self.cfg.min_contour_area:
-                best = c
-                best_area = a
-
         # draw crosshair (frame center)
-        overlay = frame.copy()
+        with self._overlay_cond:
+            buf = self._overlay_pool.pop() if self._overlay_pool else None
+        if buf is not None and buf.shape[:2] != (h, w):
+            buf = None
+        overlay = cv2.cvtColor(gray, cv2.COLOR_GRAY2BGR, dst=buf)
         self._draw_crosshair(overlay, (cx, cy), (255, 128, 0), 11, 2)  # blue-ish center
 
-        if best is None:
-            # no sun found: render mask hint (optional)
-            return self._encode_overlay(overlay), None, None, None, False
-
-        M = cv2.moments(best)
-        if M["m00"] == 0:
-            return self._encode_overlay(overlay), None, None, None, False
-        tx = int(M["m10"] / M["m00"])
-        ty = int(M["m01"] / M["m00"])
-
-        dx = tx - cx
-        dy = ty - cy
-        r = float(np.hypot(dx, dy))
-
-        # draw detected centroid + error vector
-        self._draw_crosshair(overlay, (tx, ty), (0, 0, 255), 11, 2)     # red = target centroid
-        cv2.line(overlay, (cx, cy), (tx, ty), (0, 200, 0), 2)           # green = error vector
-        cv2.circle(overlay, (cx, cy), self.cfg.lock_radius_px, (0, 170, 0), 1)  # lock ring
-
-        return self._encode_overlay(overlay), float(dx), float(dy), r, True
+        if target is not None:
+            tx, ty = target
+            # draw detected centroid + error vector
+            self._draw_crosshair(overlay, (tx, ty), (0, 0, 255), 11, 2)     # red = target centroid
+            cv2.line(overlay, (cx, cy), (tx, ty), (0, 200, 0), 2)           # green = error vector
+            cv2.circle(overlay, (cx, cy), self.cfg.lock_radius_px, (0, 170, 0), 1)  # lock ring
+        return overlay
+
+    def _make_processor(self, cfg: GuiderConfig):
+        """Detection specialized for cfg: settings are bound once as closure locals
+        instead of being looked up on self.cfg for every frame."""
+        k = self._odd(cfg.blur_ksize) if cfg.blur_ksize > 1 else 0
+        ksize = (k, k)
+        min_area = max(1, cfg.min_contour_area)
+        pad = cfg.roi_pad_px
+        box_filter = cv2.boxFilter
+        threshold = cv2.threshold
+        components = cv2.connectedComponentsWithStatsWithAlgorithm
+        BINARY, CV_32S, GRANA, AREA = cv2.THRESH_BINARY, cv2.CV_32S, cv2.CCL_GRANA, cv2.CC_STAT_AREA
+        argmax, hypot = np.argmax, np.hypot
+
+        def detect(gray, roi):
+            """Centroid of the largest bright blob inside roi, in full-frame pixels. Updates self._roi."""
+            x0, y0, x1, y1 = roi
+            sub = gray[y0:y1, x0:x1]
+            if self._buf_blur is None or self._buf_blur.shape != gray.shape:
+                self._buf_blur = np.empty_like(gray)
+                self._buf_mask = np.empty_like(gray)
+            sh, sw = sub.shape
+            if k:
+                sub = box_filter(sub, -1, ksize, dst=self._buf_blur[:sh, :sw])
+
+            # Label the thresholded blobs in one pass and keep the largest, so speckles or a
+            # second bright patch can't drag the centroid
+            level = self._thresh_level
+            _, mask = threshold(sub, level, 255, BINARY, dst=self._buf_mask[:sh, :sw])
+            n, _, stats, _ = components(mask, 8, CV_32S, GRANA)
+            if n < 2:
+                self._roi = None
+                return None
+            best = 1 + int(argmax(stats[1:, AREA]))  # label 0 is background
+            bx, by, bw, bh, area = (int(v) for v in stats[best])
+            if area < min_area:
+                self._roi = None
+                return None
+
+            # Centroid weighted by intensity above the disk/sky level inside that blob's box,
+            # which tracks a partially resolved limb better than a binary mask
+            mx, my, _ = _weighted_centroid(sub[by:by + bh, bx:bx + bw], int(level))
+            tx = x0 + bx + mx
+            ty = y0 + by + my
+
+            h, w = gray.shape[:2]
+            self._roi = (max(0, x0 + bx - pad), max(0, y0 + by - pad),
+                         min(w, x0 + bx + bw + pad), min(h, y0 + by + bh + pad))
+            return int(tx), int(ty)
+
+        def process(gray, now_ns):
+            """(target, dx, dy, r, found) for one gray frame seen at monotonic now_ns."""
+            h, w = gray.shape[:2]
+            cx, cy = w // 2, h // 2
+
+            self._refresh_threshold(gray, now_ns)
+
+            # Search around the last disk first; fall back to the full frame when it's lost
+            target = detect(gray, self._roi) if self._roi is not None else None
+            if target is None:
+                target = detect(gray, (0, 0, w, h))
+
+            if target is None:
+                return None, None, None, None, False
+            dx = target[0] - cx
+            dy = target[1] - cy
+            return target, float(dx), float(dy), float(hypot(dx, dy)), True
+
+        return process
+
+    def _refresh_threshold(self, gray: np.ndarray, now_ns: int):
+        """The disk/sky split barely moves frame to frame; re-run Otsu only every thresh_refresh_s."""
+        if (self._thresh_level is not None
+                and now_ns - self._thresh_ns < self.cfg.thresh_refresh_s * 1e9):
+            return
+        small = cv2.resize(gray, None, fx=0.25, fy=0.25, interpolation=cv2.INTER_AREA)
+        otsu, _ = cv2.threshold(small, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+        if self._thresh_level is None:
+            self._thresh_level = otsu
+        else:
+            a = self.cfg.thresh_ema_alpha
+            self._thresh_level = (1.0 - a) * self._thresh_level + a * otsu
+        self._thresh_ns = now_ns
 
     @staticmethod
     def _odd(n: int) -> int:
@@ -212,53 +455,95 @@ class AutoGuider:
         cv2.line(img, (x, y - size), (x, y + size), color, thick)
         cv2.circle(img, (x, y), 2, color, -1)
 
-    def _encode_overlay(self, img: np.ndarray) -> str:
-        encode_param = [int(cv2.IMWRITE_JPEG_QUALITY), int(self.cfg.jpeg_quality)]
+    def _encode_overlay(self, img: np.ndarray, quality: int) -> Optional[bytes]:
+        if _turbo is not None:
+            return _turbo.encode(img, quality=quality, jpeg_subsample=TJSAMP_420)
+        encode_param = [int(cv2.IMWRITE_JPEG_QUALITY), quality]
         ok, enc = cv2.imencode(".jpg", img, encode_param)
         if not ok:
             return None
-        b64 = base64.b64encode(enc.tobytes()).decode("ascii")
-        return f"data:image/jpeg;base64,{b64}"
-
-    def _push_overlay(self, overlay_b64: Optional[str]):
-        self._last_overlay_b64 = overlay_b64
-        if _socketio and overlay_b64:
-            _socketio.emit("guiding_overlay", overlay_b64)
+        return enc.tobytes()
+
+    def _push_overlay(self, gray: np.ndarray, target: Optional[Tuple[int, int]], now_ns: int):
+        """Render the overlay only if it will be sent, then hand it to the encoder thread;
+        an unencoded older one is dropped."""
+        if _socketio is None:
+            return  # nobody to show it to
+        prev = self._prev_centroid
+        if (target is not None and prev is not None
+                and abs(target[0] - prev[0]) < 1 and abs(target[1] - prev[1]) < 1
+                and now_ns - self._prev_emit_ns < self.cfg.overlay_hold_s * 1e9):
+            return  # nothing visibly changed
+        self._prev_centroid = target
+        self._prev_emit_ns = now_ns
+
+        overlay = self._render_overlay(gray, target)
+        quality = self.cfg.jpeg_quality_locked if self._locked else self.cfg.jpeg_quality
+        with self._overlay_cond:
+            if self._pending_overlay is not None:
+                self._overlay_pool.append(self._pending_overlay[0])  # superseded before encoding
+            self._pending_overlay = (overlay, int(quality))
+            self._overlay_cond.notify()
+
+    def _recycle_overlay(self, overlay: np.ndarray):
+        with self._overlay_cond:
+            if len(self._overlay_pool) < 3:
+                self._overlay_pool.append(overlay)
+
+    def _encoder_loop(self):
+        while self._running:
+            with self._overlay_cond:
+                if self._pending_overlay is None:
+                    self._overlay_cond.wait(0.5)
+                pending, self._pending_overlay = self._pending_overlay, None
+            if pending is None:
+                continue
+            try:
+                jpeg = self._encode_overlay(*pending)
+            except Exception as e:
+                emit_log(f"[GUIDER] overlay encode error: {e}")
+                continue
+            finally:
+                self._recycle_overlay(pending[0])
+            self._last_overlay_jpeg = jpeg
+            if _socketio and jpeg:
+                # Raw bytes go out as a Socket.IO binary attachment, no base64
+                _socketio.emit("guiding_overlay", jpeg)
 
     # ---------- guidance ----------
 
     def _guide(self, dx: float, dy: float, r: float):
+        cfg = self.cfg
+
         # lock logic (purely for status)
-        if r <= self.cfg.lock_radius_px:
-            self._lock_streak = min(self._lock_streak + 1, self.cfg.lock_hold_frames)
+        if r <= cfg.lock_radius_px:
+            self._lock_streak = min(self._lock_streak + 1, cfg.lock_hold_frames)
         else:
             self._lock_streak = max(self._lock_streak - 1, 0)
-        self._locked = self._lock_streak >= self.cfg.lock_hold_frames
+        self._locked = self._lock_streak >= cfg.lock_hold_frames
 
         # deadband: no corrections
-        if r <= self.cfg.deadband_px:
+        deadband = cfg.deadband_px
+        if r <= deadband:
             return
 
         # map pixels to ms pulse
-        ms = int(self.cfg.kp_ms_per_px * r)
-        ms = max(self.cfg.min_pulse_ms, min(ms, self.cfg.max_pulse_ms))
+        ms = int(cfg.kp_ms_per_px * r)
+        ms = max(cfg.min_pulse_ms, min(ms, cfg.max_pulse_ms))
 
-        now = time.time()
+        now = time.monotonic_ns()
+        interval_ns = cfg.min_axis_interval_ms * 1_000_000
 
         # RA correction (dx): if target is to the RIGHT (dx>0), we need to move RA EAST or WEST?
         # Without flips, assume: dx>0 => nudge EAST, dx<0 => nudge WEST.
-        if abs(dx) > self.cfg.deadband_px:
-            if (now - self._last_pulse_time["ra"]) * 1000.0 >= self.cfg.min_axis_interval_ms:
-                ra_dir = "east" if dx > 0 else "west"
-                self.mount.nudge(ra_dir, ms=ms, rate="solar")
-                self._last_pulse_time["ra"] = now
+        if abs(dx) > deadband and now - self._last_pulse_ra_ns >= interval_ns:
+            self.mount.nudge("east" if dx > 0 else "west", ms=ms, rate="solar")
+            self._last_pulse_ra_ns = now
 
         # DEC correction (dy): if target is BELOW center (dy>0), nudge SOUTH; above => NORTH.
-        if abs(dy) > self.cfg.deadband_px:
-            if (now - self._last_pulse_time["dec"]) * 1000.0 >= self.cfg.min_axis_interval_ms:
-                dec_dir = "south" if dy > 0 else "north"
-                self.mount.nudge(dec_dir, ms=ms, rate="solar")
-                self._last_pulse_time["dec"] = now
+        if abs(dy) > deadband and now - self._last_pulse_dec_ns >= interval_ns:
+            self.mount.nudge("south" if dy > 0 else "north", ms=ms, rate="solar")
+            self._last_pulse_dec_ns = now
 
     # ---------- status ----------
 
@@ -270,12 +555,14 @@ class AutoGuider:
 
         status = {
             "status": state if self._running else "IDLE",
-            "fps": round(self._fps, 2) if self._fps else "--",
+            "fps": round(self._fps, 1) if self._fps else "--",
             "locked": bool(self._locked),
             "dx": None if dx is None else round(float(dx), 1),
             "dy": None if dy is None else round(float(dy), 1),
             "r":  None if r  is None else round(float(r), 1),
         }
+        if status == self._last_status:
+            return  # steady state: nothing new for the UI
         self._last_status = status
 
         if _socketio:
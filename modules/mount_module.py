@@ -1,8 +1,10 @@
 # Mount Module
 # Mount control module using INDIGO JSON client (Mount Agent native)
 
+import queue
 import threading
 import time
+from functools import lru_cache
 from typing import Optional
 
 from utilities.indigo_json_client import IndigoJSONClient
@@ -40,6 +42,8 @@ class MountControl:
         - "mount_status": "IDLE|SLEWING|PARKED"
     """
 
+    _AXIS_OF = {"east": "ra", "west": "ra", "north": "dec", "south": "dec"}
+
     def __init__(self, indigo_client: IndigoJSONClient):
         self.client = indigo_client
         self.device = "Mount Agent"  # from your property dump
@@ -58,10 +62,28 @@ class MountControl:
             "moving_dec": False,
         }
 
-        # Pulse (nudge) control
-        self._pulse_lock = threading.Lock()
-        self._pulse_thread: Optional[threading.Thread] = None
-        self._pulse_active = False
+        # Last MOUNT_SLEW_RATE member we wrote (or saw reported); skips redundant rate writes
+        self._last_rate_sent: Optional[str] = None
+
+        # Motion control: one worker drains (axis, direction, ms, rate) commands in order;
+        # ms=None is a continuous slew and axis=None is stop()
+        self._pulse_q: "queue.Queue" = queue.Queue()
+        self._halted = threading.Event()  # set once the worker has sent the latest stop()
+        self._pulse_thread = threading.Thread(target=self._pulse_worker, daemon=True)
+        self._pulse_thread.start()
+
+        # Property name -> handler(items) for this device's updates
+        self._num_dispatch = {
+            "AGENT_MOUNT_EQUATORIAL_COORDINATES": self._on_equatorial,
+            "MOUNT_EQUATORIAL_COORDINATES": self._on_equatorial,
+            "MOUNT_HORIZONTAL_COORDINATES": self._on_horizontal,
+        }
+        self._switch_dispatch = {
+            "MOUNT_SLEW_RATE": self._on_slew_rate,
+            "MOUNT_MOTION_RA": self._on_motion_ra,
+            "MOUNT_MOTION_DEC": self._on_motion_dec,
+            "MOUNT_PARK": self._on_park,
+        }
 
         # Subscribe to INDIGO updates
         self.client.on("setNumberVector", self._handle_number_vector)
@@ -73,29 +95,29 @@ class MountControl:
 
     # ---------------- Formatting helpers ----------------
 
+    # Coordinates usually repeat between polls, so the last few strings are cached.
+    # Formatting works on integer hundredths of a second to avoid float carry (59.999 -> 60.00).
+
     @staticmethod
+    @lru_cache(maxsize=32)
     def format_ra(ra_h):
         """Decimal hours -> HH:MM:SS.ss"""
         if ra_h is None:
             return "--:--:--"
-        hours = int(ra_h)
-        minutes_f = (ra_h - hours) * 60.0
-        minutes = int(minutes_f)
-        seconds = (minutes_f - minutes) * 60.0
-        return f"{hours:02}:{minutes:02}:{seconds:05.2f}"
+        hours, cs = divmod(int(round(ra_h * 360000)), 360000)
+        minutes, cs = divmod(cs, 6000)
+        return "%02d:%02d:%02d.%02d" % (hours, minutes, cs // 100, cs % 100)
 
     @staticmethod
+    @lru_cache(maxsize=32)
     def format_dec(dec_deg):
         """Decimal degrees -> ±DD:MM:SS.ss"""
         if dec_deg is None:
             return "--:--:--"
         sign = "-" if dec_deg < 0 else "+"
-        d = abs(dec_deg)
-        degrees = int(d)
-        minutes_f = (d - degrees) * 60.0
-        minutes = int(minutes_f)
-        seconds = (minutes_f - minutes) * 60.0
-        return f"{sign}{degrees:02}:{minutes:02}:{seconds:05.2f}"
+        degrees, cs = divmod(int(round(abs(dec_deg) * 360000)), 360000)
+        minutes, cs = divmod(cs, 6000)
+        return "%s%02d:%02d:%02d.%02d" % (sign, degrees, minutes, cs // 100, cs % 100)
 
     # ---------------- Emitting ----------------
 
@@ -130,70 +152,61 @@ class MountControl:
         if msg.get("device") != self.device:
             return
 
-        name = msg.get("name")
-        items = {it["name"]: it.get("value") for it in msg.get("items", [])}
+        fn = self._num_dispatch.get(msg.get("name"))
+        if fn is not None:
+            items = {it["name"]: it.get("value") for it in msg.get("items", [])}
+            if fn(items):
+                self._emit_coordinates()
+
+        # status after any numeric change (e.g., motion may have stopped)
+        self._emit_status()
 
-        changed = False
+    def _set_if_changed(self, key: str, value) -> bool:
+        if value is None:
+            return False
+        value = float(value)
+        if value == self._state[key]:
+            return False
+        self._state[key] = value
+        return True
 
+    def _on_equatorial(self, items: dict) -> bool:
         # Prefer Agent coordinates for display but accept mount native too
-        if name in ("AGENT_MOUNT_EQUATORIAL_COORDINATES", "MOUNT_EQUATORIAL_COORDINATES"):
-            ra = items.get("RA")
-            dec = items.get("DEC")
-            if ra is not None:
-                ra_f = float(ra)
-                if ra_f != self._state["ra_h"]:
-                    self._state["ra_h"] = ra_f
-                    changed = True
-            if dec is not None:
-                dec_f = float(dec)
-                if dec_f != self._state["dec_deg"]:
-                    self._state["dec_deg"] = dec_f
-                    changed = True
-
-        elif name == "MOUNT_HORIZONTAL_COORDINATES":
-            alt = items.get("ALT")
-            az = items.get("AZ")
-            if alt is not None:
-                alt_f = float(alt)
-                if alt_f != self._state["alt_deg"]:
-                    self._state["alt_deg"] = alt_f
-                    changed = True
-            if az is not None:
-                az_f = float(az)
-                if az_f != self._state["az_deg"]:
-                    self._state["az_deg"] = az_f
-                    changed = True
-
-        if changed:
-            self._emit_coordinates()
+        ra_changed = self._set_if_changed("ra_h", items.get("RA"))
+        dec_changed = self._set_if_changed("dec_deg", items.get("DEC"))
+        return ra_changed or dec_changed
 
-        # status after any numeric change (e.g., motion may have stopped)
-        self._emit_status()
+    def _on_horizontal(self, items: dict) -> bool:
+        alt_changed = self._set_if_changed("alt_deg", items.get("ALT"))
+        az_changed = self._set_if_changed("az_deg", items.get("AZ"))
+        return alt_changed or az_changed
 
     def _handle_switch_vector(self, msg: dict):
         """Capture motion, park, slew rate switches."""
         if msg.get("device") != self.device:
             return
 
-        name = msg.get("name")
-        items = {it["name"]: it.get("value") for it in msg.get("items", [])}
+        fn = self._switch_dispatch.get(msg.get("name"))
+        if fn is not None:
+            fn({it["name"]: it.get("value") for it in msg.get("items", [])})
 
-        if name == "MOUNT_SLEW_RATE":
-            for rate in ("GUIDE", "CENTERING", "FIND", "MAX"):
-                if items.get(rate, False):
-                    self._state["slew_rate"] = rate
-                    break
+        self._emit_status()
 
-        elif name == "MOUNT_MOTION_RA":
-            self._state["moving_ra"] = bool(items.get("WEST", False) or items.get("EAST", False))
+    def _on_slew_rate(self, items: dict):
+        for rate in ("GUIDE", "CENTERING", "FIND", "MAX"):
+            if items.get(rate, False):
+                self._state["slew_rate"] = rate
+                self._last_rate_sent = rate  # changed elsewhere too (hand controller, other client)
+                break
 
-        elif name == "MOUNT_MOTION_DEC":
-            self._state["moving_dec"] = bool(items.get("NORTH", False) or items.get("SOUTH", False))
+    def _on_motion_ra(self, items: dict):
+        self._state["moving_ra"] = bool(items.get("WEST", False) or items.get("EAST", False))
 
-        elif name == "MOUNT_PARK":
-            self._state["parked"] = bool(items.get("PARKED", False))
+    def _on_motion_dec(self, items: dict):
+        self._state["moving_dec"] = bool(items.get("NORTH", False) or items.get("SOUTH", False))
 
-        self._emit_status()
+    def _on_park(self, items: dict):
+        self._state["parked"] = bool(items.get("PARKED", False))
 
     # ---------------- Commands ----------------
 
@@ -225,168 +238,133 @@ class MountControl:
         # default 'solar' button maps to a gentle nudge rate
         return "GUIDE"
 
-    def _set_slew_rate_switch(self, ui_rate: str):
+    def _slew_rate_msg(self, ui_rate: str) -> Optional[dict]:
+        """MOUNT_SLEW_RATE write for ui_rate, or None if the mount is already there."""
         want = self._map_ui_rate(ui_rate)
-        items = [
-            {"name": "GUIDE", "value": want == "GUIDE"},
-            {"name": "CENTERING", "value": want == "CENTERING"},
-            {"name": "FIND", "value": want == "FIND"},
-            {"name": "MAX", "value": want == "MAX"},
-        ]
-        self.client.send({
+        if want == self._last_rate_sent:
+            return None
+        return {
             "newSwitchVector": {
                 "device": self.device,
                 "name": "MOUNT_SLEW_RATE",
-                "items": items
+                "items": [{"name": m, "value": m == want} for m in ("GUIDE", "CENTERING", "FIND", "MAX")]
             }
-        }, quiet=True)
+        }
+
+    def _send_with_rate(self, ui_rate: str, msg: dict):
+        """Send msg preceded by a slew-rate change if one is needed, in one write."""
+        rate_msg = self._slew_rate_msg(ui_rate)
+        self.client.send_many([rate_msg, msg] if rate_msg else [msg], quiet=True)
+        if rate_msg:
+            self._last_rate_sent = self._map_ui_rate(ui_rate)
 
     def slew(self, direction, rate="solar"):
         """Begin continuous motion in a cardinal direction. Call stop() to end."""
         direction = (direction or "").lower()
         emit_log(f"[MOUNT] Slew start: {direction} ({rate})")
 
-        self._set_slew_rate_switch(rate)
-
-        if direction in ("east", "west"):
-            self.client.send({
-                "newSwitchVector": {
-                    "device": self.device,
-                    "name": "MOUNT_MOTION_RA",
-                    "items": [
-                        {"name": "WEST", "value": direction == "west"},
-                        {"name": "EAST", "value": direction == "east"},
-                    ]
-                }
-            }, quiet=True)
-
-        elif direction in ("north", "south"):
-            self.client.send({
-                "newSwitchVector": {
-                    "device": self.device,
-                    "name": "MOUNT_MOTION_DEC",
-                    "items": [
-                        {"name": "NORTH", "value": direction == "north"},
-                        {"name": "SOUTH", "value": direction == "south"},
-                    ]
-                }
-            }, quiet=True)
-        else:
+        axis = self._AXIS_OF.get(direction)
+        if axis is None:
             emit_log(f"[MOUNT] ERROR invalid slew direction: {direction}")
+            return
+        # Through the pulse worker, so a stop queued just before can't land after it
+        self._pulse_q.put((axis, direction, None, rate))
 
     def stop(self):
         """Stop both axes motion (and cancel any active pulse)."""
         emit_log("[MOUNT] Stop motion")
-        # cancel pulse if active
-        with self._pulse_lock:
-            self._pulse_active = False
+        # The pulse worker sends the halt, so it lands after every move queued before it
+        self._halted.clear()
+        self._pulse_q.put((None, None, 0, None))
 
+    def _halt(self):
+        """Stop both axes and abort in one write; pulse worker only, so it stays in queue order."""
         try:
-            self.client.send({
-                "newSwitchVector": {
-                    "device": self.device,
-                    "name": "MOUNT_MOTION_DEC",
-                    "items": [{"name": "NORTH", "value": False}, {"name": "SOUTH", "value": False}]
-                }
-            }, quiet=True)
-            self.client.send({
-                "newSwitchVector": {
-                    "device": self.device,
-                    "name": "MOUNT_MOTION_RA",
-                    "items": [{"name": "WEST", "value": False}, {"name": "EAST", "value": False}]
-                }
-            }, quiet=True)
-            # optional hard abort (safe no-op if ignored)
-            self.client.send({
-                "newSwitchVector": {
-                    "device": self.device,
-                    "name": "MOUNT_ABORT_MOTION",
-                    "items": [{"name": "ABORT_MOTION", "value": True}]
-                }
-            }, quiet=True)
+            self.client.send_many([
+                self._motion_msg("dec", None),
+                self._motion_msg("ra", None),
+                # optional hard abort (safe no-op if ignored)
+                {
+                    "newSwitchVector": {
+                        "device": self.device,
+                        "name": "MOUNT_ABORT_MOTION",
+                        "items": [{"name": "ABORT_MOTION", "value": True}]
+                    }
+                },
+            ], quiet=True)
         except Exception as e:
             emit_log(f"[MOUNT] Stop failed: {e}")
 
     def nudge(self, direction: str, ms: int = 200, rate: str = "solar"):
         """
         Fire a short motion pulse in one direction, then stop automatically.
-        Safe against double-click spam via a lightweight lock.
+        Pulses are queued to a single worker; a repeat on a moving axis extends it.
         """
         direction = (direction or "").lower()
         ms = max(20, min(int(ms), 5000))  # clamp 20ms..5s
+        axis = self._AXIS_OF.get(direction)
+        if axis is None:
+            emit_log(f"[MOUNT] ERROR invalid nudge direction: {direction}")
+            return
+        self._pulse_q.put((axis, direction, ms, rate))
 
-        def _pulse():
+    def _motion_msg(self, axis: str, direction: Optional[str]) -> dict:
+        """Drive one axis in direction, or stop it when direction is None."""
+        if axis == "ra":
+            name, members = "MOUNT_MOTION_RA", ("WEST", "EAST")
+        else:
+            name, members = "MOUNT_MOTION_DEC", ("NORTH", "SOUTH")
+        want = (direction or "").upper()
+        return {
+            "newSwitchVector": {
+                "device": self.device,
+                "name": name,
+                "items": [{"name": m, "value": m == want} for m in members]
+            }
+        }
+
+    def _pulse_worker(self):
+        active = {}  # axis -> (direction, monotonic stop time)
+        while True:
+            timeout = None
+            if active:
+                timeout = max(0.0, min(t for _, t in active.values()) - time.monotonic())
             try:
-                self._set_slew_rate_switch(rate)
-
-                # start motion
-                if direction in ("east", "west"):
-                    self.client.send({
-                        "newSwitchVector": {
-                            "device": self.device,
-                            "name": "MOUNT_MOTION_RA",
-                            "items": [
-                                {"name": "WEST", "value": direction == "west"},
-                                {"name": "EAST", "value": direction == "east"},
-                            ]
-                        }
-                    }, quiet=True)
-                elif direction in ("north", "south"):
-                    self.client.send({
-                        "newSwitchVector": {
-                            "device": self.device,
-                            "name": "MOUNT_MOTION_DEC",
-                            "items": [
-                                {"name": "NORTH", "value": direction == "north"},
-                                {"name": "SOUTH", "value": direction == "south"},
-                            ]
-                        }
-                    }, quiet=True)
-                else:
-                    emit_log(f"[MOUNT] ERROR invalid nudge direction: {direction}")
-                    return
-
-                # hold for pulse duration unless cancelled
-                start = time.time()
-                while True:
-                    with self._pulse_lock:
-                        if not self._pulse_active:
-                            break
-                    if (time.time() - start) * 1000.0 >= ms:
-                        break
-                    time.sleep(0.01)
-
-            finally:
-                # stop axis used
-                if direction in ("east", "west"):
-                    self.client.send({
-                        "newSwitchVector": {
-                            "device": self.device,
-                            "name": "MOUNT_MOTION_RA",
-                            "items": [{"name": "WEST", "value": False}, {"name": "EAST", "value": False}]
-                        }
-                    }, quiet=True)
-                elif direction in ("north", "south"):
-                    self.client.send({
-                        "newSwitchVector": {
-                            "device": self.device,
-                            "name": "MOUNT_MOTION_DEC",
-                            "items": [{"name": "NORTH", "value": False}, {"name": "SOUTH", "value": False}]
-                        }
-                    }, quiet=True)
-                with self._pulse_lock:
-                    self._pulse_active = False
-
-        # Start/replace a pulse
-        with self._pulse_lock:
-            # cancel any prior pulse loop and mark new active
-            self._pulse_active = False
-        # tiny pause to allow any prior loop to notice cancellation
-        time.sleep(0.01)
-        with self._pulse_lock:
-            self._pulse_active = True
-        self._pulse_thread = threading.Thread(target=_pulse, daemon=True)
-        self._pulse_thread.start()
+                axis, direction, ms, rate = self._pulse_q.get(timeout=timeout)
+            except queue.Empty:
+                pass
+            else:
+                try:
+                    if axis is None:
+                        active.clear()
+                        self._halt()  # both axes, so any pulse still running ends here too
+                        self._halted.set()
+                    elif ms is None:
+                        # continuous slew: runs until stop(), so drop any pending pulse stop
+                        active.pop(axis, None)
+                        self._send_with_rate(rate, self._motion_msg(axis, direction))
+                    else:
+                        stop_at = time.monotonic() + ms / 1000.0
+                        cur = active.get(axis)
+                        if cur is not None and cur[0] == direction:
+                            # same axis and direction still moving: just push the stop out
+                            active[axis] = (direction, max(cur[1], stop_at))
+                        else:
+                            self._send_with_rate(rate, self._motion_msg(axis, direction))
+                            active[axis] = (direction, stop_at)
+                except Exception as e:
+                    emit_log(f"[MOUNT] Pulse failed: {e}")
+
+            now = time.monotonic()
+            due = [ax for ax, (_, t) in active.items() if t <= now]
+            if due:
+                for ax in due:
+                    del active[ax]
+                try:
+                    # axes ending together stop in one write
+                    self.client.send_many([self._motion_msg(ax, None) for ax in due], quiet=True)
+                except Exception as e:
+                    emit_log(f"[MOUNT] Pulse stop failed: {e}")
 
     def _slew_to_coords(self, ra_h, dec_deg):
         """Agent-friendly slew to target coordinates."""
@@ -490,15 +468,11 @@ class MountControl:
                 "MOUNT_MOTION_DEC",
                 "MOUNT_PARK",
             ]
+            # Built once; all seven requests go out in a single socket write per tick
+            requests = [{"getProperties": {"device": self.device, "name": nm}} for nm in names_to_poll]
             while self._mon_running:
                 try:
-                    for nm in names_to_poll:
-                        self.client.send({
-                            "getProperties": {
-                                "device": self.device,
-                                "name": nm
-                            }
-                        }, quiet=True)
+                    self.client.send_many(requests, quiet=True)
                 except Exception as e:
                     emit_log(f"[MOUNT] Monitor poll error: {e}")
                 time.sleep(1)
@@ -511,6 +485,7 @@ class MountControl:
         self._mon_running = False
         try:
             self.stop()
+            self._halted.wait(2.0)  # let the halt go out before the socket closes
         except Exception:
             pass
         try:
@@ -1,6 +1,7 @@
 # nSTEP Focuser Module
 # Focuser control module using INDIGO JSON client
 
+import queue
 import threading
 from utilities.indigo_json_client import IndigoJSONClient
 
@@ -17,6 +18,10 @@ class NStepFocuser:
         self.current_position = 0  # Updated by feedback
         self.set_position = 0      # Target set by user
 
+        # One poller for the life of the focuser; bursts of requests coalesce in the queue
+        self._poll_q = queue.Queue(maxsize=4)
+        threading.Thread(target=self._poll_worker, daemon=True).start()
+
     def move(self, direction, speed=50):
         if direction not in ("in", "out", "stop"):
             return
@@ -30,27 +35,29 @@ class NStepFocuser:
 
         self.set_position = speed  # Store set speed for feedback
 
-        self.client.send({
-            "setProperties": {
-                "device": self.device,
-                "name": "FOCUSER_MOTION",
-                "elements": {
-                    "FOCUSER_INWARD": motion["IN"],
-                    "FOCUSER_OUTWARD": motion["OUT"],
-                    "FOCUSER_ABORT_MOTION": motion["ABORT"]
+        # Motion and speed go out in one write so they can't be split or reordered
+        self.client.send_many([
+            {
+                "setProperties": {
+                    "device": self.device,
+                    "name": "FOCUSER_MOTION",
+                    "elements": {
+                        "FOCUSER_INWARD": motion["IN"],
+                        "FOCUSER_OUTWARD": motion["OUT"],
+                        "FOCUSER_ABORT_MOTION": motion["ABORT"]
+                    }
                 }
-            }
-        })
-
-        self.client.send({
-            "setProperties": {
-                "device": self.device,
-                "name": "FOCUSER_SPEED",
-                "elements": {
-                    "FOCUSER_SPEED_VALUE": speed
+            },
+            {
+                "setProperties": {
+                    "device": self.device,
+                    "name": "FOCUSER_SPEED",
+                    "elements": {
+                        "FOCUSER_SPEED_VALUE": speed
+                    }
                 }
-            }
-        })
+            },
+        ])
 
         self._emit_position_feedback()
 
@@ -61,7 +68,15 @@ class NStepFocuser:
                 "name": "FOCUSER_POSITION"
             }
         })
-        threading.Thread(target=self._poll_position, daemon=True).start()
+        try:
+            self._poll_q.put_nowait(None)
+        except queue.Full:
+            pass  # enough polls already pending
+
+    def _poll_worker(self):
+        while True:
+            self._poll_q.get()
+            self._poll_position()
 
     def _poll_position(self):
         try:
@@ -1,19 +1,23 @@
 # Server Module
 # Remote INDIGO server controller for Flask GUI or CLI
 
+import re
+import socket
 import threading
-import time
 from utilities.config import RASPBERRY_PI_IP
 from utilities.indigo_json_client import IndigoJSONClient
 from utilities.network_utils import (
-    get_ssh_client,
+    get_pooled_client,
     stream_ssh_output,
-    run_ssh_command,
     check_remote_port
 )
 
 indigo_client = IndigoJSONClient(RASPBERRY_PI_IP)
 
+_SENTINEL = "__END__"
+_READY_RE = re.compile(r"server started.*?\b(\d{2,5})\b", re.IGNORECASE)
+_SENTINEL_RE = re.compile(_SENTINEL + r"(\d+)\r?\n")  # never matches the echoed "echo __END__$?"
+
 def start_indigo_client():
     import threading
     threading.Thread(target=indigo_client.connect, daemon=True).start()
@@ -27,55 +31,108 @@ class IndigoRemoteServer:
         self.client = None
         self.running = False
         self.thread = None
+        self._shell = None              # persistent remote shell for short commands
+        self._shell_lock = threading.Lock()
+        self._ready = threading.Event()  # set once the server logs that it is listening
 
     def connect(self):
-        if not self.client:
-            self.client = get_ssh_client(self.ip, self.username, self.password)
+        transport = self.client.get_transport() if self.client else None
+        if transport is None or not transport.is_active():
+            # Shared with run_pi_ssh_command: one transport, one channel per use
+            self.client = get_pooled_client(self.ip, self.username, self.password)
+            self._shell = None
+        if self._shell is None or self._shell.closed:
+            self._shell = self.client.invoke_shell()
+            self._shell.send("stty -echo; export PS1='' PS2=''\n")
+            self._read_until_sentinel(self._send_marked("true"))  # swallow banner/MOTD
+
+    def _send_marked(self, cmd):
+        self._shell.send(f"{cmd}; echo {_SENTINEL}$?\n")
+        return self._shell
+
+    def _read_until_sentinel(self, chan, timeout=5.0):
+        chan.settimeout(timeout)
+        buf = ""
+        while True:
+            m = _SENTINEL_RE.search(buf)
+            if m:
+                return buf[:m.start()], int(m.group(1))
+            data = chan.recv(4096)
+            if not data:
+                raise EOFError("remote shell closed")
+            buf += data.decode(errors="replace")
+
+    def _exec(self, cmd, timeout=5.0):
+        """Run a short command in the persistent shell; same result shape as run_ssh_command."""
+        with self._shell_lock:
+            try:
+                self.connect()
+                out, code = self._read_until_sentinel(self._send_marked(cmd), timeout)
+            except (socket.timeout, EOFError, OSError):
+                if self._shell is not None:
+                    self._shell.close()  # out of sync or dead; reopen on next call
+                self._shell = None
+                raise
+        return {"stdout": out.strip(), "stderr": "", "returncode": code}
 
     def start(self, callback):
         """Start INDIGO server remotely and stream output via callback."""
-        self.connect()
+        with self._shell_lock:
+            self.connect()
         self.running = True
 
+        ready = threading.Event()
+        self._ready = ready
+
+        def on_line(line):
+            if not ready.is_set() and _READY_RE.search(line):
+                ready.set()
+            callback(line)
+
+        def streamer():
+            try:
+                stream_ssh_output(self.client, "indigo_server", on_line)
+            except Exception as e:
+                callback(f"[ERROR] INDIGO server stream failed: {e}")
+            finally:
+                self.running = False
+                ready.set()  # don't leave the runner waiting on a dead server
+
         def runner():
             try:
                 # Kill existing INDIGO instances
-                run_ssh_command(self.client, "pkill -f indigo_server")
-
-                # Start server in background
-                stream_ssh_output(self.client, "indigo_server", callback)
-
+                self._exec("pkill -f indigo_server")
             except Exception as e:
                 callback(f"[ERROR] INDIGO server stream failed: {e}")
                 self.running = False
                 return
 
-            # Wait for port to be available (max 10s)
-            for i in range(20):  # Try every 0.5s for 10 seconds
-                if check_remote_port(self.ip, self.port):
-                    callback(f"[INDIGO] Server online at {self.ip}:{self.port}")
-                    start_indigo_client()
-                    break
-                else:
-                    callback(f"[INDIGO] Waiting for server port {self.port}... ({i+1}/20)")
-                    time.sleep(0.5)
+            # Server output streams for as long as it runs; wake on its ready line
+            threading.Thread(target=streamer, daemon=True).start()
+            ready.wait(timeout=10.0)
+
+            # Trust the ready line; on a timeout or dead stream, probe the port once instead
+            if (ready.is_set() and self.running) or check_remote_port(self.ip, self.port):
+                callback(f"[INDIGO] Server online at {self.ip}:{self.port}")
+                start_indigo_client()
             else:
                 callback(f"[INDIGO] Failed to detect server after 10s.")
 
-            self.running = False
-
         self.thread = threading.Thread(target=runner, daemon=True)
         self.thread.start()
 
     def stop(self):
         """Stop INDIGO server process remotely."""
-        self.connect()
         self.running = False
-        return run_ssh_command(self.client, "pkill -f indigo_server")
+        return self._exec("pkill -f indigo_server")
 
     def check_status(self):
         """Check if INDIGO server is active on port 7624."""
-        return check_remote_port(self.ip, self.port)
+        try:
+            res = self._exec(f"ss -ltn 'sport = :{self.port}' | grep -q LISTEN && echo UP")
+            return "UP" in res["stdout"]
+        except Exception:
+            return check_remote_port(self.ip, self.port)  # SSH unavailable: probe the port
 
     def get_status(self):
         """Return current status as a simple dict."""
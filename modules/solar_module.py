@@ -3,10 +3,18 @@
 # Set for latitude and longitude of Chapel Hill, NC
 
 from arrow import now
+import math
+import threading
+import time
+from functools import lru_cache
 import ephem
+import numpy as np
 from datetime import datetime, timezone, timedelta
-from utilities.config import GEO_LAT, GEO_LON, GEO_ELEV, solar_cache
+from utilities.config import GEO_LAT, GEO_LON, GEO_ELEV
 from utilities.logger import emit_log
+from utilities.solar_fast import sun_position
+
+FAST_TOLERANCE_DEG = 0.02  # closed-form vs PyEphem agreement required to use the fast path
 
 _socketio = None
 
@@ -14,6 +22,49 @@ def set_socketio(sio):
     global _socketio
     _socketio = sio
 
+def _make_cache_key(body, time_bucket, location):
+    return (body, time_bucket, location)
+
+def _sample_ephem(observer, ts, sun=None):
+    alt, az, ra, dec = (np.empty(len(ts)) for _ in range(4))
+    sun = sun or ephem.Sun()
+    for i, t in enumerate(ts):
+        observer.date = datetime.utcfromtimestamp(t)
+        sun.compute(observer)
+        alt[i], az[i], ra[i], dec[i] = sun.alt, sun.az, sun.ra, sun.dec
+    return alt, az, ra, dec
+
+@lru_cache(maxsize=8)
+def _day_path_cached(ordinal, lat_q, lon_q, interval, use_fast=True):
+    """Sunrise-to-sunset arc for one local date and site, as an immutable tuple."""
+    observer = ephem.Observer()
+    observer.lat = str(lat_q)
+    observer.lon = str(lon_q)
+    observer.elev = GEO_ELEV
+    sun = ephem.Sun()
+    # Anchor on local noon so the rise/set pair always brackets that date
+    observer.date = datetime.fromordinal(ordinal).replace(hour=12).astimezone(timezone.utc)
+    sunrise_utc = observer.previous_rising(sun)
+    sunset_utc = observer.next_setting(sun)
+
+    # Whole arc in one vectorized pass; dicts are only built at the end
+    t0 = sunrise_utc.datetime().replace(tzinfo=timezone.utc).timestamp()
+    t1 = sunset_utc.datetime().replace(tzinfo=timezone.utc).timestamp()
+    ts = np.arange(t0, t1, interval * 60.0)
+    if use_fast:
+        lat_r = math.radians(lat_q)
+        alt, az, _, _ = sun_position(ts, math.sin(lat_r), math.cos(lat_r), lon_q)
+    else:
+        alt, az, _, _ = _sample_ephem(observer, ts)
+    alt = np.round(np.clip(np.degrees(alt), 0.0, 90.0), 2)
+    az = np.round(np.degrees(az) % 360.0, 2)
+    stamps = [f"{lt.hour:02d}:{lt.minute:02d}" for lt in map(datetime.fromtimestamp, ts.tolist())]
+    path = tuple({"az": a, "alt": h, "time": s}
+                 for a, h, s in zip(az.tolist(), alt.tolist(), stamps))
+
+    emit_log(f"[SOLAR] ☀️ Generated {len(path)} points from {ephem.localtime(sunrise_utc)} to {ephem.localtime(sunset_utc)}")
+    return path
+
 class SolarPosition:
     def __init__(self, latitude=GEO_LAT, longitude=GEO_LON):
         self.latitude = str(latitude)
@@ -22,10 +73,25 @@ class SolarPosition:
         self.observer.lat = self.latitude
         self.observer.lon = self.longitude
         self.observer.elev = GEO_ELEV
+        self._sun = ephem.Sun()  # one Body, recomputed in place for every ephem query
+        self._lock = threading.RLock()  # shared instance: monitor loop and socket handlers
         self.local_tz = timezone(timedelta(hours=-5))  # Adjust for your time zone
 
         self.last_sun_time = "--"
 
+        # Per-second cache of body coordinates; UI bursts share one computation
+        self._body_cache = {}
+
+        # Sun sampled over the local day; ticks interpolate instead of calling ephem
+        self._table = None
+        self._use_fast = None  # decided by _check_fast() on the first table build
+        self._lon_deg = float(longitude)
+        self._sin_lat = math.sin(math.radians(float(latitude)))
+        self._cos_lat = math.cos(math.radians(float(latitude)))
+        self.alt_deg = None  # last computed sun alt/az in degrees (floats)
+        self.az_deg = None
+        self._last_emit = None  # _emit_key() of the last solar_update sent
+        self._fmt_cache = (None, "--")  # (epoch second, "HH:MM:SS")
 
         self.sun_times = {
             "sunrise": "--",
@@ -42,11 +108,15 @@ class SolarPosition:
         self.update_sun_times()
 
     def update_sun_times(self):
+        with self._lock:  # observer is shared with the table build
+            self._update_sun_times()
+
+    def _update_sun_times(self):
         try:
             self.observer.date = datetime.utcnow()
-            sunrise = ephem.localtime(self.observer.next_rising(ephem.Sun()))
-            sunset = ephem.localtime(self.observer.next_setting(ephem.Sun()))
-            transit = ephem.localtime(self.observer.next_transit(ephem.Sun()))
+            sunrise = ephem.localtime(self.observer.next_rising(self._sun))
+            sunset = ephem.localtime(self.observer.next_setting(self._sun))
+            transit = ephem.localtime(self.observer.next_transit(self._sun))
 
             self.sun_times.update({
                 "sunrise": sunrise.strftime("%H:%M"),
@@ -56,36 +126,108 @@ class SolarPosition:
         except Exception as e:
             emit_log(f"[Solar] Error fetching sun times: {e}")
 
+    def _build_day_table(self, interval_sec=10):
+        """Sample alt/az/ra/dec (radians) every interval_sec from local midnight to the next."""
+        midnight = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        t0 = midnight.timestamp()
+        t1 = (midnight + timedelta(days=1)).timestamp()  # 23 or 25 h away on DST days
+        n = int((t1 - t0) // interval_sec) + 2
+        ts = t0 + interval_sec * np.arange(n, dtype=np.float64)
+
+        if self._use_fast is None:
+            self._use_fast = self._check_fast()
+        if self._use_fast:
+            alt, az, ra, dec = sun_position(ts, self._sin_lat, self._cos_lat, self._lon_deg)
+        else:
+            alt, az, ra, dec = _sample_ephem(self.observer, ts, self._sun)
+
+        # Unwrap the angles that cross 2π so interpolation never blends 359° with 0°
+        self._table = {"t0": t0, "dt": float(interval_sec), "alt": alt,
+                       "az": np.unwrap(az), "ra": np.unwrap(ra), "dec": dec}
+        emit_log(f"[SOLAR] Built day table: {n} samples every {interval_sec}s")
+
+    def _check_fast(self):
+        """Compare the closed-form sun with PyEphem across today; fall back to ephem if off."""
+        ts = datetime.now().replace(hour=12, minute=0, second=0, microsecond=0).timestamp() \
+            + 3600.0 * np.arange(-4, 5)
+        fast = sun_position(ts, self._sin_lat, self._cos_lat, self._lon_deg)
+        ref = _sample_ephem(self.observer, ts, self._sun)
+        wrap = lambda d: (d + np.pi) % (2 * np.pi) - np.pi
+        # On-sky error: az/ra differences shrink by cos(alt)/cos(dec)
+        scale = (1.0, np.cos(ref[0]), np.cos(ref[3]), 1.0)
+        up = ref[0] > math.radians(5)  # refraction models disagree near the horizon
+        err = max(float(np.max(np.abs(wrap(f - r) * k)[up], initial=0.0))
+                  for f, r, k in zip(fast, ref, scale))
+        err = math.degrees(err)
+        if err > FAST_TOLERANCE_DEG:
+            emit_log(f"[SOLAR] Closed-form sun off by {err:.3f}° vs ephem; using ephem samples")
+            return False
+        return True
+
+    def _sun_at(self, t_unix):
+        """Interpolated (alt, az, ra, dec) in radians; rebuilds the table when the day rolls over."""
+        tb = self._table
+        if tb is None or not 0.0 <= (t_unix - tb["t0"]) / tb["dt"] < len(tb["alt"]) - 1:
+            with self._lock:  # one rebuild per rollover, whoever gets here first
+                tb = self._table
+                if tb is None or not 0.0 <= (t_unix - tb["t0"]) / tb["dt"] < len(tb["alt"]) - 1:
+                    self._build_day_table()
+                    tb = self._table
+        idx = (t_unix - tb["t0"]) / tb["dt"]
+        i = int(idx)
+        f = idx - i
+        two_pi = 2.0 * np.pi
+
+        def lerp(a):
+            return float(a[i] + (a[i + 1] - a[i]) * f)
+
+        return lerp(tb["alt"]), lerp(tb["az"]) % two_pi, lerp(tb["ra"]) % two_pi, lerp(tb["dec"])
+
+    def _now_hms(self):
+        """Local HH:MM:SS, formatted at most once per second."""
+        sec = int(time.time())
+        if self._fmt_cache[0] != sec:
+            lt = time.localtime(sec)
+            self._fmt_cache = (sec, f"{lt.tm_hour:02d}:{lt.tm_min:02d}:{lt.tm_sec:02d}")
+        return self._fmt_cache[1]
+
     def update_solar_position(self):
+        with self._lock:
+            self._update_solar_position()
+
+    def _update_solar_position(self):
         try:
-            self.observer.date = datetime.utcnow()
-            sun = ephem.Sun(self.observer)
-            alt = float(sun.alt) * 180.0 / ephem.pi
-            az = float(sun.az) * 180.0 / ephem.pi
+            alt_r, az_r, _, _ = self._sun_at(time.time())
+            # Numeric values stay available to callers; the payload is formatted last
+            self.alt_deg = math.degrees(alt_r)
+            self.az_deg = math.degrees(az_r)
+            up = self.alt_deg > 0
 
-            last_time = self.solar_position.get("sun_time", "--")
-            now_str  = datetime.now().strftime("%H:%M:%S")
+            now_str = self._now_hms()
 
             self.solar_position.update({
-                "solar_alt": round(alt, 2) if alt > 0 else "Below Horizon",
-                "solar_az": round(az, 2) if alt > 0 else "Below Horizon",
+                "solar_alt": round(self.alt_deg, 2) if up else "Below Horizon",
+                "solar_az": round(self.az_deg, 2) if up else "Below Horizon",
                 "sun_time": now_str,
-                "last_sun_time": last_time,
             })
 
         except Exception as e:
             emit_log(f"[Solar] Error calculating solar position: {e}")
 
     def get_solar_equatorial(self):
+        key = _make_cache_key("sun", int(time.time()), (self.latitude, self.longitude))
+        cached = self._body_cache.get(key)
+        if cached is not None:
+            return cached
         try:
-            self.observer.date = datetime.utcnow()
-            sun = ephem.Sun(self.observer)
-            ra = sun.ra  # in radians internally, but str is formatted
-            dec = sun.dec
-            return {
-                "ra_solar": str(ra),   # HH:MM:SS
-                "dec_solar": str(dec)  # ±DD:MM:SS
+            _, _, ra, dec = self._sun_at(time.time())
+            result = {
+                "ra_solar": str(ephem.hours(ra)),   # HH:MM:SS
+                "dec_solar": str(ephem.degrees(dec))  # ±DD:MM:SS
             }
+            self._body_cache.clear()
+            self._body_cache[key] = result
+            return result
         except Exception as e:
             emit_log(f"[Solar] Error getting RA/DEC: {e}")
             return {
@@ -98,54 +240,37 @@ class SolarPosition:
     
     def get_full_day_path(self, interval_minutes=5):
         try:
-            now = datetime.now()
-            today = now.date()
-            cached_date = solar_cache.get("date")
-
-            if cached_date == today and solar_cache.get("path"):
-                return solar_cache["path"]
-
-            # Compute new path
-            self.observer.date = now
-            sun = ephem.Sun()
-            sunrise_utc = self.observer.previous_rising(sun) if now < ephem.localtime(self.observer.next_rising(sun)) else self.observer.next_rising(sun)
-            sunset_utc = self.observer.next_setting(sun)
-
-            times = []
-            t = sunrise_utc
-            while t < sunset_utc:
-                times.append(t)
-                t = ephem.Date(t + interval_minutes / (24 * 60))
-
-            path = []
-            for t in times:
-                self.observer.date = t
-                sun = ephem.Sun(self.observer)
-                alt = float(sun.alt) * 180.0 / ephem.pi
-                az = float(sun.az) * 180.0 / ephem.pi
-                alt = max(0, min(alt, 90))
-                az = az % 360
-                timestamp = ephem.localtime(t).strftime("%H:%M")
-                path.append({"az": round(az, 2), "alt": round(alt, 2), "time": timestamp})
-
-            # Cache it
-            solar_cache["date"] = now.date()
-            solar_cache["path"] = path
-
-            emit_log(f"[SOLAR] ☀️ Generated {len(path)} points from {ephem.localtime(sunrise_utc)} to {ephem.localtime(sunset_utc)}")
-            return path
-
+            if self._use_fast is None:
+                with self._lock:  # _check_fast moves the shared observer and body
+                    if self._use_fast is None:
+                        self._use_fast = self._check_fast()
+            return list(_day_path_cached(datetime.now().toordinal(),
+                                         round(float(self.latitude), 4),
+                                         round(float(self.longitude), 4),
+                                         interval_minutes, self._use_fast))
         except Exception as e:
             emit_log(f"[SOLAR] Error generating sun path: {e}")
             return []
 
+    def _emit_key(self):
+        """What the client can actually see change: alt/az to 0.1° plus the day's times."""
+        pos = (None if self.alt_deg is None else round(self.alt_deg, 1),
+               None if self.az_deg is None else round(self.az_deg, 1))
+        return pos + tuple(self.sun_times.values())
+
     def start_monitor(self, socketio, interval=20):
+        def emit_if_changed():
+            key = self._emit_key()
+            if key != self._last_emit:
+                socketio.emit("solar_update", self.get_data())
+                self._last_emit = key
+
         def loop():
             emit_log("[SOLAR] Monitor loop running")
 
             self.update_sun_times()
             self.update_solar_position()
-            socketio.emit("solar_update", self.get_data())
+            emit_if_changed()
 
             count = 0
             while True:
@@ -154,8 +279,13 @@ class SolarPosition:
 
                 if count % (6 * 60 * 60 // interval) == 0:
                     self.update_sun_times()
+                    self._last_emit = None  # always push refreshed rise/set times
 
-                socketio.emit("solar_update", self.get_data())
+                emit_if_changed()
                 count += 1
 
-        socketio.start_background_task(loop)
\ No newline at end of file
+        socketio.start_background_task(loop)
+
+
+# Shared instance: one observer, day table and sun-times cache for every consumer
+solar_position = SolarPosition()
@@ -4,7 +4,34 @@
 
 import requests
 import time
+from dataclasses import dataclass, field, fields
 from datetime import datetime
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from utilities import json_utils
+
+@dataclass(slots=True)
+class WeatherSnapshot:
+    """Latest reading, updated in place; to_dict() reuses its dict until a field changes."""
+    temperature: float | str = "--"
+    wind_speed: float | str = "--"
+    sky_conditions: str = "unknown"
+    precip_chance: int | str = "--"
+    last_checked: str = "--"
+    _dict: dict = field(default=None, init=False, repr=False, compare=False)
+
+    def update(self, **values):
+        for name, value in values.items():
+            setattr(self, name, value)
+        self._dict = None
+
+    def to_dict(self):
+        """Shared with every caller and the emit queue until the next update(): read it, never mutate it."""
+        if self._dict is None:
+            self._dict = {f.name: getattr(self, f.name) for f in fields(self) if f.init}
+        return self._dict
+
 
 class WeatherForecast:
     def __init__(self, latitude=35.9132, longitude=-79.0558):
@@ -18,38 +45,49 @@ class WeatherForecast:
             f"&forecast_days=1"
             f"&timezone=America/New_York"
         )
-        self.weather_data = {
-            'temperature': "--",
-            'wind_speed': "--",
-            'sky_conditions': "unknown",
-            'precip_chance': "--",
-            'last_checked': "--"
-        }
+        self._snap = WeatherSnapshot()
+
+        # One kept-alive, gzip'd connection to Open-Meteo across polls
+        self._session = requests.Session()
+        self._session.headers.update({"Accept-Encoding": "gzip"})
+        self._session.mount("https://", HTTPAdapter(
+            pool_connections=1, pool_maxsize=1,
+            max_retries=Retry(total=2, backoff_factor=0.5)))
+        self._last_modified = None  # server's Last-Modified, echoed as If-Modified-Since
 
     def check_weather(self):
         try:
-            res = requests.get(self.api_url, timeout=5)
+            headers = {"If-Modified-Since": self._last_modified} if self._last_modified else None
+            res = self._session.get(self.api_url, timeout=(2, 5), headers=headers)
+            if res.status_code == 304:  # unchanged since last poll: skip parsing
+                self._snap.update(last_checked=datetime.now().strftime('%m-%d %H:%M:%S'))
+                return
             res.raise_for_status()
-            body = res.json()
+            self._last_modified = res.headers.get("Last-Modified")
+            body = json_utils.loads(res.content)
 
             current = body.get("current_weather", {})
             hourly = body.get("hourly", {})
             precip_list = hourly.get("precipitation_probability", [])
             precip_chance = precip_list[0] if precip_list else "--"
 
-            self.weather_data = {
-                'temperature': round(current.get('temperature', 0), 2),
-                'wind_speed': current.get('windspeed', "--"),
-                'sky_conditions': "CLEAR" if current.get('weathercode', 0) in [0, 1] else "CLOUDY",
-                'precip_chance': round(precip_chance) if isinstance(precip_chance, (int, float)) else "--",
-                'last_checked': datetime.now().strftime('%m-%d %H:%M:%S')
-            }
+            self._snap.update(
+                temperature=round(current.get('temperature', 0), 2),
+                wind_speed=current.get('windspeed', "--"),
+                sky_conditions="CLEAR" if current.get('weathercode', 0) in [0, 1] else "CLOUDY",
+                precip_chance=round(precip_chance) if isinstance(precip_chance, (int, float)) else "--",
+                last_checked=datetime.now().strftime('%m-%d %H:%M:%S'),
+            )
 
         except Exception as e:
             print(f"[Weatherman] Error fetching weather: {e}")
 
+    @property
+    def weather_data(self):
+        return self._snap.to_dict()
+
     def get_data(self):
-        return self.weather_data
+        return self._snap.to_dict()
 
     def start_monitor(self, socketio, interval=600):
         def loop():
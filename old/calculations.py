@@ -1,17 +1,19 @@
 # Cross reference calculations for telescope coordinates
 
+import functools
+import logging
+
+import numpy as np
 from astropy.time import Time
-from astropy.coordinates import EarthLocation, AltAz, ICRS, SkyCoord, get_sun
+from astropy.coordinates import EarthLocation, AltAz, ICRS, SkyCoord, Angle, get_sun
 import astropy.units as u
 
-# Observer's location (Chapel Hill, NC)
-location = EarthLocation(lat=35.9132*u.deg, lon=-79.0558*u.deg, height=80*u.m)
-
-# Current time
-now = Time.now()
+logger = logging.getLogger(__name__)
 
-# Define the AltAz frame
-altaz_frame = AltAz(obstime=now, location=location)
+@functools.cache
+def get_location():
+    """Observer's location (Chapel Hill, NC); built on first use, not at import."""
+    return EarthLocation(lat=35.9132*u.deg, lon=-79.0558*u.deg, height=80*u.m)
 
 """
 # Polaris calculations
@@ -33,75 +35,84 @@ print(f"Altitude: {altitude.deg} degrees, Azimuth: {azimuth.deg} degrees")
 print("--------------------")
 """
 
-# Testing home positions
-"""Calculate home equatorial coordinates."""
-# Due west azimuth is 270 degrees, and horizon altitude is 0 degrees
-az = 270 * u.deg
-alt = 0 * u.deg
-# Create a SkyCoord object for the given alt/az
-horizontal_coord = SkyCoord(alt=alt, az=az, frame=altaz_frame)
-
-# Convert horizontal coordinates to equatorial coordinates (ICRS frame)
-# 0 - 360 Degrees Format
-equatorial_coord = horizontal_coord.transform_to(ICRS) 
-home_ra = equatorial_coord.ra.deg
-home_dec = equatorial_coord.dec.deg
-print("-*-*-*-*-*-*-*-*-*-*")
-print(f"New Calculations @ {now}")
-print("--------------------")
-print("Home West Alt & Az (Degrees):")
-print(f"Alt: {alt}, Az: {az}")
-print("--------------------")
-print("Home West RA & Dec (Degrees):")
-print(f"RA: {home_ra} degrees, Dec: {home_dec} degrees")
-print("--------------------")
-
-# Convert RA and Dec
-dec = home_dec * u.deg
-
-# Convert RA Format to hours:minutes:seconds
-ra_convert = home_ra/15.0
-ra_hours = int(ra_convert) // 1 
-ra_minutes = (ra_convert - ra_hours) * 60
-ra_seconds = (ra_minutes - int(ra_minutes)) * 60
-ra_format = f"{ra_hours}h {int(ra_minutes)}m {int(ra_seconds)}s"
-
-
-# Calculate local sidereal time & format
-lst = now.sidereal_time('apparent', longitude = location.lon)
-lst_convert = lst.hourangle
-lst_hours = int(lst.hourangle) // 1
-lst_minutes = (lst_convert - lst_hours) * 60
-lst_seconds = (lst_minutes - int(lst_minutes)) * 60
-lst_format = f"{lst_hours}h {int(lst_minutes)}m {int(lst_seconds)}s"
-print(f"Local Sidereal Time: {lst}, or {lst_format}")
-print("--------------------")
-
-
-#Calculate hour angle & format
-ha = int(lst.hourangle) - ra_convert
-print("Home West (Hour Angle)")
-ha_hours = int(ha) // 1
-ha_minutes = (ha - ha_hours) * 60
-ha_seconds = (ha_minutes - int(ha_minutes)) * 60
-ha_format = f"{ha_hours}h {int(ha_minutes)}m {int(ha_seconds)}s"
-print(f"HA: {ha}, Dec: {dec}, or {ha_format}")
-print("--------------------")
-
-
-# Calculate RA to hours:minutes:seconds format
-print("Home West (RA Format conversion)")
-print(f"RA: {ra_format} , Dec: {dec}")
-print("-*-*-*-*-*-*-*-*-*-*")
-
-# Solar Position Calculation
-sun_gcrs = get_sun(now)
-sun_altaz = sun_gcrs.transform_to(altaz_frame)
-# Convert horizontal coordinates to equatorial coordinates (ICRS frame)
-equatorial_coord = sun_altaz.transform_to(ICRS) 
-sun_ra = equatorial_coord.ra.deg
-sun_dec = equatorial_coord.dec.deg
-print("Sun Position")
-print(f"RA: {sun_ra} degrees, Dec: {sun_dec} degrees")
-print("--------------------")
-print(sun_altaz.alt.deg, sun_altaz.az.deg)
\ No newline at end of file
+def compute_home_and_sun(times: Time, location: EarthLocation) -> dict[str, np.ndarray]:
+    """Home-west RA/Dec, LST, hour angle and Sun position for every instant in `times`.
+    One AltAz frame and one transform per quantity, however many times are passed."""
+    times = Time(times)
+    altaz_frame = AltAz(obstime=times, location=location)
+
+    # Home position: due west (az 270°) on the horizon (alt 0°), one point per time
+    n = times.shape
+    horizontal_coord = SkyCoord(alt=np.zeros(n) * u.deg, az=np.full(n, 270.0) * u.deg,
+                                frame=altaz_frame)
+    equatorial_coord = horizontal_coord.transform_to(ICRS)
+
+    lst = times.sidereal_time('apparent', longitude=location.lon)
+
+    # Solar position. RA/Dec are read off the geocentric frame: pushing the Sun (which
+    # carries a distance) through ICRS would re-centre it on the barycentre.
+    sun_gcrs = get_sun(times)
+    sun_altaz = sun_gcrs.transform_to(altaz_frame)
+
+    home_ra = np.atleast_1d(equatorial_coord.ra.deg)
+    lst_hours = np.atleast_1d(lst.hourangle)
+    return {
+        'home_ra': home_ra,
+        'home_dec': np.atleast_1d(equatorial_coord.dec.deg),
+        'lst_hours': lst_hours,
+        'ha_hours': lst_hours - home_ra / 15.0,
+        'sun_ra': np.atleast_1d(sun_gcrs.ra.deg),
+        'sun_dec': np.atleast_1d(sun_gcrs.dec.deg),
+        'sun_alt': np.atleast_1d(sun_altaz.alt.deg),
+        'sun_az': np.atleast_1d(sun_altaz.az.deg),
+    }
+
+
+def _hms(hours):
+    return Angle(hours * u.hourangle).to_string(unit=u.hour, sep=':', precision=0)
+
+
+def main():
+    # Current time
+    now = Time.now()
+    res = compute_home_and_sun(now, get_location())
+    home_ra, home_dec = res['home_ra'][0], res['home_dec'][0]
+
+    logger.info("-*-*-*-*-*-*-*-*-*-*")
+    logger.info(f"New Calculations @ {now}")
+    logger.info("--------------------")
+    logger.info("Home West Alt & Az (Degrees):")
+    logger.info(f"Alt: {0 * u.deg}, Az: {270 * u.deg}")
+    logger.info("--------------------")
+    logger.info("Home West RA & Dec (Degrees):")
+    logger.info(f"RA: {home_ra} degrees, Dec: {home_dec} degrees")
+    logger.info("--------------------")
+
+    dec = home_dec * u.deg
+
+    # Local sidereal time
+    lst_hours = res['lst_hours'][0]
+    logger.info(f"Local Sidereal Time: {lst_hours}h, or {_hms(lst_hours)}")
+    logger.info("--------------------")
+
+    # Hour angle
+    ha = res['ha_hours'][0]
+    logger.info("Home West (Hour Angle)")
+    logger.info(f"HA: {ha}, Dec: {dec}, or {_hms(ha)}")
+    logger.info("--------------------")
+
+    # RA in hours:minutes:seconds
+    logger.info("Home West (RA Format conversion)")
+    logger.info(f"RA: {_hms(home_ra / 15.0)} , Dec: {dec}")
+    logger.info("-*-*-*-*-*-*-*-*-*-*")
+
+    # Solar Position Calculation
+    logger.info("Sun Position")
+    logger.info(f"RA: {res['sun_ra'][0]} degrees, Dec: {res['sun_dec'][0]} degrees")
+    logger.info("--------------------")
+    logger.info(f"{res['sun_alt'][0]} {res['sun_az'][0]}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    main()
@@ -1,11 +1,12 @@
 # Startup script to initialize the mount with location and home coordinates.
 
-import subprocess
 import time as pytime  # Renamed to avoid conflict with astropy's Time class
 from astropy.coordinates import SkyCoord, EarthLocation, AltAz, ICRS, get_sun
 from astropy.time import Time
 import astropy.units as u
 
+from modules.server_module import indigo_client
+
 class MountControl:
     def __init__(self, output_callback):
         """Mount & location settings."""
@@ -20,14 +21,13 @@ class MountControl:
         """Log output through the callback to app.py."""
         self.output_callback(f"{message}")
 
-    def run_command(self, command):
-        """Execute a shell command and return the output."""
-        try:
-            result = subprocess.run(command, shell=True, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            return result.stdout.decode('utf-8')
-        except subprocess.CalledProcessError as e:
-            self.log(f"Error executing command: {e.stderr.decode('utf-8')}")
-            return None
+    def _switch(self, name, *on):
+        return {"newSwitchVector": {"device": self.mount_device, "name": name,
+                                    "items": [{"name": item, "value": True} for item in on]}}
+
+    def _number(self, name, **values):
+        return {"newNumberVector": {"device": self.mount_device, "name": name,
+                                    "items": [{"name": k, "value": float(v)} for k, v in values.items()]}}
 
     def get_home_coordinates(self):
         """Calculate home equatorial coordinates."""
@@ -64,35 +64,28 @@ class MountControl:
 
     def initialize_mount(self):
         """Initalize mount."""
+        if not indigo_client.connected:
+            indigo_client.connect(max_retries=3)
 
-        # Connect the mount
+        # Connect the mount; give the driver a moment before it takes property sets
         self.log("Connecting to the mount...")
-        self.run_command(f"indigo_prop_tool set \"{self.mount_device}.CONNECTION.CONNECTED=ON\"")
-
-        # Initialize the mount with geographic coordinates
-        self.log("Setting the location...")
-        self.run_command(f"indigo_prop_tool set \"{self.mount_device}.GEOGRAPHIC_COORDINATES.LATITUDE={self.latitude};LONGITUDE={self.longitude};ELEVATION={self.altitude}\"")
-
-        # On coordinate set sync
-        self.log("Setting on coordinate set sync...")
-        self.run_command(f"indigo_prop_tool set \"{self.mount_device}.MOUNT_ON_COORDINATES_SET.SYNC=ON\"")
-
-        # Set tracking to solar rate
-        self.log("Setting tracking to solar rate...")
-        self.run_command(f"indigo_prop_tool set \"{self.mount_device}.MOUNT_TRACK_RATE.SOLAR=ON\"")
-
-        # Turning tracking on
-        self.log("Turning tracking on...")
-        self.run_command(f"indigo_prop_tool set \"{self.mount_device}.MOUNT_TRACKING.ON=ON\"")
-        self.run_command(f'indigo_prop_tool set "{self.mount_device}.MOUNT_TRACKING.OFF=OFF\"')
+        indigo_client.send(self._switch("CONNECTION", "CONNECTED"))
+        pytime.sleep(1.0)
 
         # Calculate home coordinates
         home_ra, home_dec = self.get_home_coordinates()
         self.log(f"Home coordinates at RA: {home_ra}, DEC: {home_dec}")
 
-        # Sync the telescope with home equatorial coordinates
-        self.log("Syncing the telescope with home coordinates...")
-        self.run_command(f"indigo_prop_tool set \"{self.mount_device}.MOUNT_EQUATORIAL_COORDINATES.RA={home_ra};DEC={home_dec}\"")
+        # Location, sync-on-set, solar tracking and the home sync in one write, in order
+        self.log("Setting location, solar tracking and syncing to home coordinates...")
+        indigo_client.send_many([
+            self._number("GEOGRAPHIC_COORDINATES", LATITUDE=self.latitude,
+                         LONGITUDE=self.longitude, ELEVATION=self.altitude),
+            self._switch("MOUNT_ON_COORDINATES_SET", "SYNC"),
+            self._switch("MOUNT_TRACK_RATE", "SOLAR"),
+            self._switch("MOUNT_TRACKING", "ON"),
+            self._number("MOUNT_EQUATORIAL_COORDINATES", RA=home_ra / 15.0, DEC=home_dec),
+        ])
 
         self.log("Mount initialization complete.")
 
@@ -2,16 +2,35 @@
 
 import time as pytime  # Renamed to avoid conflict with astropy's Time class
 import subprocess
-from astropy.coordinates import get_sun, EarthLocation, AltAz, SkyCoord, ICRS
+from functools import lru_cache
+from astropy.coordinates import get_sun, EarthLocation
 from astropy.time import Time
 import astropy.units as u
 
+from modules.server_module import indigo_client
+
+LOCATION = EarthLocation(lat=35.9132*u.deg, lon=-79.0558*u.deg, height=80*u.m)  # Chapel Hill, NC coordinates
+
+# Re-slew only once the Sun has moved past the mount's resolution (degrees)
+THRESH_RA = 0.01
+THRESH_DEC = 0.01
+
+@lru_cache(maxsize=256)
+def _sun_radec_cached(jd_rounded: float) -> tuple[float, float]:
+    """Geocentric apparent Sun RA/Dec (degrees) for a quantized Julian date."""
+    # Read RA/Dec off get_sun() directly: sending the Sun (which has a distance)
+    # through ICRS would re-centre it on the solar-system barycentre.
+    sun = get_sun(Time(jd_rounded, format='jd'))
+    return sun.ra.deg, sun.dec.deg
+
+
 class MountControl:
     def __init__(self):
         """Initialize Mount & Location."""
         #self.indigo_server = 'localhost'
         self.mount_device = 'Mount PMC Eight'
-        self.location = EarthLocation(lat=35.9132*u.deg, lon=-79.0558*u.deg, height=80*u.m)  # Chapel Hill, NC coordinates
+        self.location = LOCATION
+        self._last_slew = (None, None)  # RA/Dec of the last slew sent
 
     def run_command(self, command):
         """Execute a shell command and return the output."""
@@ -27,14 +46,8 @@ class MountControl:
         
         now = Time.now()  # Current UTC time
         print("Current time:", now)
-        sun_gcrs = get_sun(now)
-        altaz_frame = AltAz(obstime=now, location=self.location)
-        sun_altaz = sun_gcrs.transform_to(altaz_frame)
-
-        # Convert horizontal coordinates to equatorial coordinates (ICRS frame)
-        equatorial_coord = sun_altaz.transform_to(ICRS) 
-        sun_ra = equatorial_coord.ra.deg
-        sun_dec = equatorial_coord.dec.deg
+        jd = round(now.jd * 86400) / 86400.0  # 1 s bucket; solar RA/Dec drift ~0.00004°/s
+        sun_ra, sun_dec = _sun_radec_cached(jd)
 
         """
         # Convert RA Format to hours:minutes:seconds
@@ -46,6 +59,17 @@ class MountControl:
         """
         return sun_ra, sun_dec
 
+    def get_mount_coordinates(self):
+        """Mount RA/Dec in degrees from one INDIGO property read, or (None, None)."""
+        state = indigo_client.get_property(self.mount_device, "MOUNT_EQUATORIAL_COORDINATES")
+        if not state:
+            return None, None
+        elements = state["elements"]
+        try:
+            return float(elements["RA"]["value"]) * 15.0, float(elements["DEC"]["value"])  # RA arrives in hours
+        except (KeyError, TypeError, ValueError):
+            return None, None
+
     def initial_slew(self):
         """Initial slew to the Sun's position."""
         # Retrieve the current RA and DEC from the mount
@@ -82,17 +106,25 @@ class MountControl:
 
         # Update the Solar coordinates
         solar_ra, solar_dec = self.get_sun_coordinates()
+
+        # Sidereal/solar tracking covers the drift between updates; skip sub-resolution moves
+        last_ra, last_dec = self._last_slew
+        if (last_ra is not None and abs(solar_ra - last_ra) <= THRESH_RA
+                and abs(solar_dec - last_dec) <= THRESH_DEC):
+            return
+
         print(f"Updating target coordinates to RA: {solar_ra}, Dec: {solar_dec}")
 
         # Slew to the updated coordinates
         self.run_command(f"indigo_prop_tool set \"{self.mount_device}.MOUNT_EQUATORIAL_COORDINATES.RA={solar_ra};DEC={solar_dec}\"")
+        self._last_slew = (solar_ra, solar_dec)
 
-        # Get the current azimuth and altitude
-        current_ra = self.run_command(f"indigo_prop_tool get \"{self.mount_device}.MOUNT_EQUATORIAL_COORDINATES.RA\"")
-        current_dec = self.run_command(f"indigo_prop_tool get \"{self.mount_device}.MOUNT_EQUATORIAL_COORDINATES.DEC\"")
+        # Get the current RA/Dec (both elements of one property, one read)
+        current_ra, current_dec = self.get_mount_coordinates()
 
         # Assuming a small tolerance, check if the mount is on target
-        if abs(current_ra - solar_ra) < 0.5 and abs(current_ra - solar_dec) < 0.5:
+        if (current_ra is not None and abs(current_ra - solar_ra) < 0.5
+                and abs(current_dec - solar_dec) < 0.5):
             print("Mount is on target.")
         else:
             print(f"Current RA: {current_ra}, Current Dec: {current_dec}. Waiting for mount to finish slewing...")
@@ -102,6 +134,8 @@ class MountControl:
         print("Mount position updated. Waiting for next update...")
 
 def main():
+    if not indigo_client.connected:
+        indigo_client.connect(max_retries=3)
     mount_control = MountControl()
 
     # Run initial_slew once to position the telescope towards the Sun initially
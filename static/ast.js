@@ -43,16 +43,29 @@ serverBtn.addEventListener("click", () => {
 // Handle live INDIGO server log streaming
 const MAX_LOG_LINES = 100;
 
-socket.on("server_log", (msg) => {
-  const line = document.createElement("div");
-  line.textContent = msg;
-  logBox.appendChild(line);
+function appendLogLines(msgs) {
+  const frag = document.createDocumentFragment();
+  for (const msg of msgs.slice(-MAX_LOG_LINES)) {
+    const line = document.createElement("div");
+    line.textContent = msg;
+    frag.appendChild(line);
+  }
+  logBox.appendChild(frag);
 
   while (logBox.children.length > MAX_LOG_LINES) {
     logBox.removeChild(logBox.firstChild);
   }
 
   logBox.scrollTop = logBox.scrollHeight;
+}
+
+socket.on("server_log", (msg) => appendLogLines([msg]));
+socket.on("server_log_batch", (msgs) => appendLogLines(msgs));
+
+// Backlog replayed once on connect
+socket.on("server_log_history", (msgs) => {
+  logBox.innerHTML = "";
+  appendLogLines(msgs);
 });
 
 // Poll for server status every 5 seconds
@@ -272,8 +285,13 @@ socket.on("solar_update", (data) => {
   document.getElementById("sunrise").textContent     = data.sunrise ?? "--";
   document.getElementById("sunset").textContent      = data.sunset ?? "--";
   document.getElementById("solar_noon").textContent  = data.solar_noon ?? "--";
-  document.getElementById("sun_time").textContent    = data.sun_time ?? "--";
-  document.getElementById("last_sun_time").textContent = data.last_sun_time ?? "--";
+  // "Last Update" is the previous sun_time; the server no longer sends it separately
+  const sunTimeEl = document.getElementById("sun_time");
+  const sunTime = data.sun_time ?? "--";
+  if (sunTime !== sunTimeEl.textContent) {
+    document.getElementById("last_sun_time").textContent = sunTimeEl.textContent;
+    sunTimeEl.textContent = sunTime;
+  }
   // document.getElementById("current_time").textContent = data.current_time ?? "--";
 
   if (data.solar_az && data.solar_alt) {
@@ -682,9 +700,14 @@ document.getElementById("autoguider-off").addEventListener("click", () => {
   socket.emit("autoguider_stop");
 });
 
-// overlay image pushed from backend as data URL
-socket.on("guiding_overlay", (dataUrl) => {
-  if (agImg) agImg.src = dataUrl;  // data:image/jpeg;base64,...
+// overlay image pushed from backend as raw JPEG bytes
+let agOverlayUrl = null;
+socket.on("guiding_overlay", (buf) => {
+  if (!agImg) return;
+  const url = URL.createObjectURL(new Blob([buf], { type: "image/jpeg" }));
+  agImg.src = url;
+  if (agOverlayUrl) URL.revokeObjectURL(agOverlayUrl);  // free the previous frame
+  agOverlayUrl = url;
 });
 
 // status/metrics
@@ -0,0 +1,53 @@
+# File module tests
+# Settling bookkeeping across scans of the watched share
+
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from modules import file_module
+
+
+def _entry(path, size, mtime=0.0):
+    name = path.rsplit("\\", 1)[-1]
+    return SimpleNamespace(path=path, name=name, stat=lambda: SimpleNamespace(st_size=size, st_mtime=mtime))
+
+
+class PendingTest(unittest.TestCase):
+    def setUp(self):
+        self.listing = []
+        smb = mock.patch.object(file_module, "smbclient")
+        self.smb = smb.start()
+        self.addCleanup(smb.stop)
+        self.smb.path.exists.return_value = True
+        self.smb.scandir.side_effect = lambda path: iter(self.listing)
+        for target in ("queue_emit", "emit_log"):
+            patcher = mock.patch.object(file_module, target)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(file_module.FILE_STATUS.clear)
+        self.handler = file_module.FileHandler()
+
+    def test_file_vanishing_before_settling_clears_pending(self):
+        _, today = self.handler._watch_paths()
+        self.listing = [_entry(today + "\\cap1.avi", 100)]
+        self.handler.check_directory()
+        self.assertTrue(self.handler.has_pending())
+
+        self.listing = []  # deleted mid-write
+        self.handler.check_directory()
+        self.assertFalse(self.handler.has_pending())
+        self.assertEqual(self.handler._size_history, {})
+
+    def test_missing_today_folder_clears_pending(self):
+        _, today = self.handler._watch_paths()
+        self.listing = [_entry(today + "\\cap1.avi", 100)]
+        self.handler.check_directory()
+        self.smb.path.exists.side_effect = lambda path: path != today
+        self.handler.check_directory()
+        self.assertFalse(self.handler.has_pending())
+        self.assertEqual(self.handler._size_history, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+# Guide module tests
+# Weighted centroid on a synthetic solar disk
+
+import unittest
+
+import numpy as np
+
+from modules import guide_module
+
+
+def _limb_darkened_disk(h=120, w=160, cx=70.3, cy=55.8, radius=40.0, sky=20, peak=230):
+    """Gray frame with a disk whose brightness falls off toward the limb."""
+    y, x = np.mgrid[0:h, 0:w]
+    rr = np.hypot(x - cx, y - cy) / radius
+    mu = np.sqrt(np.clip(1.0 - rr ** 2, 0.0, 1.0))
+    img = np.where(rr < 1.0, sky + (peak - sky) * (0.4 + 0.6 * mu), sky)
+    return img.astype(np.uint8)
+
+
+class WeightedCentroidTest(unittest.TestCase):
+    def test_numpy_finds_disk_centre(self):
+        gray = _limb_darkened_disk()
+        x, y, n = guide_module._weighted_centroid_np(gray, 60)
+        self.assertAlmostEqual(x, 70.3, delta=0.1)
+        self.assertAlmostEqual(y, 55.8, delta=0.1)
+        self.assertGreater(n, 0)
+
+    def test_weights_are_level_above_threshold(self):
+        gray = np.zeros((1, 4), np.uint8)
+        gray[0, 1], gray[0, 3] = 70, 100  # 10 and 40 above the split
+        x, _, n = guide_module._weighted_centroid_np(gray, 60)
+        self.assertEqual(n, 2)
+        self.assertAlmostEqual(x, (1 * 10 + 3 * 40) / 50)
+
+    @unittest.skipIf(guide_module.njit is None, "numba not installed")
+    def test_numba_matches_numpy(self):
+        gray = _limb_darkened_disk()
+        for thresh in (20, 60, 150):
+            fast = guide_module._weighted_centroid(gray, thresh)
+            ref = guide_module._weighted_centroid_np(gray, thresh)
+            self.assertEqual(fast[2], ref[2])
+            self.assertAlmostEqual(fast[0], ref[0], places=3)
+            self.assertAlmostEqual(fast[1], ref[1], places=3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+# Mount module tests
+# Motion ordering between nudges, slews and stop() through the pulse worker
+
+import threading
+import time
+import unittest
+
+from modules.mount_module import MountControl
+
+
+class SlowClient:
+    """Stand-in IndigoJSONClient that records every motion write, slowly."""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.writes = []
+        self.calls = []  # one list of messages per socket write
+        self.lock = threading.Lock()
+
+    def on(self, kind, callback):
+        pass
+
+    def send(self, message, quiet=False):
+        self.send_many([message], quiet)
+
+    def send_many(self, messages, quiet=False):
+        if any("getProperties" in m for m in messages):
+            return  # monitor polls
+        time.sleep(self.delay)
+        with self.lock:
+            self.writes.extend(messages)
+            self.calls.append(list(messages))
+
+    def axis_states(self):
+        """Last value written for each motion property: the member switched on, or None."""
+        last = {}
+        with self.lock:
+            for m in self.writes:
+                vec = m.get("newSwitchVector", {})
+                if vec.get("name") in ("MOUNT_MOTION_RA", "MOUNT_MOTION_DEC"):
+                    on = [it["name"] for it in vec["items"] if it["value"]]
+                    last[vec["name"]] = on[0] if on else None
+        return last
+
+
+class StopOrderingTest(unittest.TestCase):
+    def settle(self, mount, timeout=2.0):
+        self.assertTrue(mount._halted.wait(timeout))
+        time.sleep(0.1)  # let anything queued after the stop go out too
+
+    def test_pulses_queued_behind_stop_end_stopped(self):
+        client = SlowClient()
+        mount = MountControl(client)
+        mount.nudge("north", ms=2000)
+        mount.nudge("east", ms=2000)
+        mount.stop()
+        self.settle(mount)
+        self.assertEqual(client.axis_states(), {"MOUNT_MOTION_DEC": None, "MOUNT_MOTION_RA": None})
+
+    def test_slew_after_stop_keeps_moving(self):
+        client = SlowClient()
+        mount = MountControl(client)
+        mount.slew("west")
+        mount.stop()
+        mount.slew("south")
+        self.settle(mount)
+        self.assertEqual(client.axis_states(), {"MOUNT_MOTION_RA": None, "MOUNT_MOTION_DEC": "SOUTH"})
+
+    def test_stop_is_one_write_after_queued_pulses(self):
+        client = SlowClient()
+        mount = MountControl(client)
+        mount.nudge("north", ms=2000)
+        mount.stop()
+        self.settle(mount)
+        names = [[m["newSwitchVector"]["name"] for m in call] for call in client.calls[1:]]
+        self.assertEqual(names[-1], ["MOUNT_MOTION_DEC", "MOUNT_MOTION_RA", "MOUNT_ABORT_MOTION"])
+        self.assertEqual(names[0][-1], "MOUNT_MOTION_DEC")  # the pulse went out first
+
+
+if __name__ == "__main__":
+    unittest.main()
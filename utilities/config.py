@@ -1,14 +1,22 @@
 # Configuration Settings
 
+import os
+from collections import OrderedDict
+
 # REMOTE DEVICE INFO
 RASPBERRY_PI_IP = "192.168.1.147"  # KC IP
 SSH_USERNAME = "pi"
 SSH_PASSWORD = "raspberry"
+SSH_KNOWN_HOSTS = os.path.expanduser("~/.astcontrol_known_hosts")  # Pi host key, recorded on first connect
+SSH_KEY_FILE = None  # optional Ed25519 private key path; password auth is the fallback
 
 GEO_LAT = 35.9132
 GEO_LON = -79.0558
 GEO_ELEV = 148  # meters
 
+# INDIGO CONNECTION
+INDIGO_NODELAY = True  # disable Nagle on the JSON client: small property sets go out immediately
+
 # WEATHER DATA
 DEFAULT_WEATHER_DATA = {
     "temperature": "--",
@@ -28,10 +36,6 @@ DEFAULT_SOLAR_DATA = {
     "sun_time": "--"
 }
 
-solar_cache = {
-    "path": None
-}
-
 # MOUNT COORDINATES
 HOME_RA = "00:00:00"
 HOME_DEC = "+00:00:00"
@@ -63,6 +67,22 @@ FILE_WATCH_LOCAL_PATH = "/home/pi/fc_files"
 # FILE_DEST_DIR = "/Users/nathnaelkahassai/Documents/preprocess" # Example path on Mac
 FILE_DEST_DIR = "C:/Users/Nathnael/Documents/preprocess"  # Example path on Windows
 
+class _CappedDict(OrderedDict):
+    """dict that forgets its oldest-inserted keys beyond `cap` entries."""
+    def __init__(self, cap):
+        super().__init__()
+        self.cap = cap
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        if len(self) > self.cap:
+            self.popitem(last=False)
+
 # Dictionary to track file statuses. Format: { "filename.avi": "Status" }
-# Possible statuses: "Detected", "Copying", "Copied", "Failed"
-FILE_STATUS = {}
\ No newline at end of file
+# Possible statuses: "Detected", "Queued", "Copying", "Copied", "Failed"
+# Capped so weeks of captures don't grow it forever; only today's folder is rescanned.
+FILE_STATUS = _CappedDict(10000)
+
+# Listing of copied files, kept current by the copy workers.
+# Format: { "<dest path>": {"name", "size", "modified", "status"} }
+FILE_INDEX = {}
\ No newline at end of file
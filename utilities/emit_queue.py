@@ -0,0 +1,61 @@
+# Emit Queue Module
+# Coalesces SocketIO emits per event and drops payloads identical to the last one sent
+
+import threading
+
+from utilities import json_utils
+from utilities.logger import emit_log
+
+FLUSH_INTERVAL = 0.05  # seconds
+
+_socketio = None
+_pending_emits = {}  # event -> (payload, volatile keys)
+_last_sent = {}      # event -> serialized payload bytes last emitted
+_lock = threading.Lock()
+
+def set_socketio(sio):
+    global _socketio
+    first = _socketio is None
+    _socketio = sio  # before the task starts: _flusher sleeps on it straight away
+    if first:
+        sio.start_background_task(_flusher)
+
+def queue_emit(event, payload, volatile=()):
+    """Stage a payload; only the latest one per event goes out on the next flush.
+    Keys listed in `volatile` (e.g. timestamps) are ignored when checking for changes."""
+    with _lock:
+        _pending_emits[event] = (payload, volatile)
+
+def forget(event=None):
+    """Clear the last-sent cache so the next flush re-sends (e.g. for a new client)."""
+    with _lock:
+        if event is None:
+            _last_sent.clear()
+        else:
+            _last_sent.pop(event, None)
+
+def _change_key(payload, volatile):
+    if volatile and isinstance(payload, dict):
+        payload = {k: v for k, v in payload.items() if k not in volatile}
+    return json_utils.dumps_bytes(payload)
+
+def _flusher():
+    while True:
+        _socketio.sleep(FLUSH_INTERVAL)
+        with _lock:
+            if not _pending_emits:
+                continue
+            batch = list(_pending_emits.items())
+            _pending_emits.clear()
+
+        for event, (payload, volatile) in batch:
+            try:
+                key = _change_key(payload, volatile)  # a bad payload must not end the flusher
+                with _lock:
+                    if _last_sent.get(event) == key:
+                        continue
+                    _last_sent[event] = key
+                _socketio.emit(event, payload)
+            except Exception as e:
+                forget(event)
+                emit_log(f"[EMIT] Failed to emit {event}: {e}")
@@ -5,7 +5,8 @@ import socket
 import threading
 import json
 import time
-import select
+from utilities import json_utils
+from utilities.config import INDIGO_NODELAY
 from utilities.logger import emit_log
 
 class IndigoJSONClient:
@@ -20,12 +21,27 @@ class IndigoJSONClient:
         self.reconnect_interval = 5
         self.retry_count = 0
         self.stop_flag = threading.Event()
+        self._props = {}  # (device, name) -> {"elements": {item: {"value": v}}}, latest seen
+        self._props_cond = threading.Condition()
+        # Reused recv scratch space: reads land here instead of in a fresh bytes per call
+        self._rx_scratch = bytearray(65536)
+        self._rx_view = memoryview(self._rx_scratch)
 
     def connect(self, max_retries=10):
         while not self.stop_flag.is_set() and self.retry_count < max_retries:
             try:
                 emit_log(f"[INDIGO] Connecting to {self.host}:{self.port}... (Attempt {self.retry_count + 1})")
                 self.sock = socket.create_connection((self.host, self.port), timeout=10)
+                if INDIGO_NODELAY:
+                    self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+                if hasattr(socket, "TCP_KEEPIDLE"):  # Linux: notice a dead Pi in ~1 min, not hours
+                    self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 30)
+                    self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, 10)
+                    self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPCNT, 3)
+                self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 256 * 1024)
+                self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 256 * 1024)
+                self.sock.settimeout(1.0)  # recv wakes at least once a second to check stop_flag
                 self.connected = True
                 self.retry_count = 0
                 emit_log("[INDIGO] Connected.")
@@ -46,10 +62,29 @@ class IndigoJSONClient:
             if not quiet:
                 emit_log("[INDIGO] Not connected — skipping send.")
             return
-        raw = json.dumps(message) + '\n'
+        raw = json_utils.dumps_bytes(message) + b'\n'
         with self.lock:
             try:
-                self.sock.sendall(raw.encode())
+                self.sock.sendall(raw)
+            except (BrokenPipeError, OSError) as e:
+                if not quiet:
+                    emit_log(f"[INDIGO] Send failed: {e}")
+                self.connected = False
+                if not quiet:
+                    raise
+
+    def send_many(self, messages, quiet: bool = False):
+        """Send several JSON messages in a single write (newline-separated)."""
+        if not messages:
+            return
+        if not self.connected or not self.sock:
+            if not quiet:
+                emit_log("[INDIGO] Not connected — skipping send.")
+            return
+        raw = b''.join(json_utils.dumps_bytes(m) + b'\n' for m in messages)
+        with self.lock:
+            try:
+                self.sock.sendall(raw)
             except (BrokenPipeError, OSError) as e:
                 if not quiet:
                     emit_log(f"[INDIGO] Send failed: {e}")
@@ -59,23 +94,54 @@ class IndigoJSONClient:
 
     def _listen_loop(self):
         """Continuously read and dispatch JSON messages from the INDIGO server."""
-        buffer = ''
+        # Receive buffer owned by this listener thread alone (send() never touches it);
+        # raw bytes, with complete lines drained in place. Fresh per connection.
+        self._rx_buf = buffer = bytearray()
+        # Hot-loop locals: one lookup each instead of per message
+        cbs = self.callbacks
+        loads = json_utils.loads  # orjson when available; reads memoryviews in place
+        cache = self._cache_property
+        emit = emit_log
+        recv_into = self.sock.recv_into
+        scratch = self._rx_view
         try:
             while not self.stop_flag.is_set():
-                # Wait up to 1 second for data to become readable
-                ready, _, _ = select.select([self.sock], [], [], 1.0)
-                if ready:
-                    data = self.sock.recv(4096).decode()
-                    if not data:
-                        emit_log("[INDIGO] Connection closed by remote.")
-                        break
-                    buffer += data
-                    while '\n' in buffer:
-                        line, buffer = buffer.split('\n', 1)
-                        self._dispatch(line.strip())
-                else:
-                    # No data yet — skip this loop cycle
+                # Blocks until data arrives, or times out after 1 second
+                try:
+                    n = recv_into(scratch)
+                except socket.timeout:
                     continue
+                if not n:
+                    emit_log("[INDIGO] Connection closed by remote.")
+                    break
+                buffer += scratch[:n]
+                # Parse complete lines through a view (no per-line copy), then drop
+                # them from the buffer in one go once the view is released.
+                start = 0
+                idx = buffer.find(b'\n')
+                with memoryview(buffer) as mv:
+                    while idx >= 0:
+                        line = mv[start:idx]
+                        start = idx + 1
+                        idx = buffer.find(b'\n', start)
+                        try:
+                            if len(line) <= 1 and not bytes(line).strip():
+                                continue  # blank keep-alive line
+                            msg = loads(line)
+                        except json.JSONDecodeError:
+                            emit(f"[INDIGO] Failed to parse: {bytes(line[:200])!r}")
+                            continue
+                        finally:
+                            line.release()  # every view must go before the buffer is trimmed
+                        if "items" in msg and "device" in msg:
+                            cache(msg)
+                        fn = cbs.get(msg.get("action") or msg.get("name"))
+                        if fn:
+                            fn(msg)
+                        else:
+                            emit(f"[INDIGO] Unhandled message: {msg}")
+                if start:
+                    del buffer[:start]
         except (ConnectionResetError, socket.timeout, OSError) as e:
             emit_log(f"[INDIGO] Listener error: {e}")
         finally:
@@ -87,17 +153,25 @@ class IndigoJSONClient:
             emit_log("[INDIGO] Disconnected. Attempting to reconnect...")
             emit_log("[INDIGO] Reconnection skipped after listener exit.")
 
-    def _dispatch(self, line: str):
-        """Handle a single JSON message from INDIGO."""
-        try:
-            msg = json.loads(line)
-            kind = msg.get("action") or msg.get("name")
-            if kind in self.callbacks:
-                self.callbacks[kind](msg)
-            else:
-                emit_log(f"[INDIGO] Unhandled message: {msg}")
-        except json.JSONDecodeError:
-            emit_log("[INDIGO] Failed to parse:", line)
+    def _cache_property(self, msg):
+        key = (msg["device"], msg.get("name"))
+        with self._props_cond:
+            elements = self._props.setdefault(key, {"elements": {}})["elements"]
+            for it in msg["items"]:
+                elements[it["name"]] = {"value": it.get("value")}
+            self._props_cond.notify_all()
+
+    def get_property(self, device, name, timeout=1.0):
+        """Latest known state of a property; asks the server and waits briefly if none yet."""
+        key = (device, name)
+        with self._props_cond:
+            state = self._props.get(key)
+        if state is None:
+            self.send({"getProperties": {"device": device, "name": name}}, quiet=True)
+            with self._props_cond:
+                self._props_cond.wait_for(lambda: key in self._props, timeout)
+                state = self._props.get(key)
+        return state
 
     def on(self, kind, callback):
         """Register callback for message kind ('set', 'get', etc)."""
@@ -0,0 +1,35 @@
+# JSON Utilities
+# orjson-backed dumps/loads with a stdlib fallback when orjson isn't installed
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    _OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def dumps_bytes(obj) -> bytes:
+        return orjson.dumps(obj, option=_OPTIONS)
+
+    def dumps(obj, **kwargs) -> str:
+        """Drop-in for json.dumps; formatting kwargs are ignored (output is always compact)."""
+        return orjson.dumps(obj, option=_OPTIONS).decode()
+
+    def loads(data, **kwargs):
+        """Accepts str, bytes, bytearray or memoryview."""
+        return orjson.loads(data)
+
+else:
+    def dumps_bytes(obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+    def dumps(obj, **kwargs) -> str:
+        return json.dumps(obj, **kwargs)
+
+    def loads(data, **kwargs):
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        return json.loads(data, **kwargs)
@@ -1,27 +1,103 @@
 # Logger Module
 # Centralized logging with SocketIO support
-from datetime import datetime
+import itertools
+import threading
+import time
+from collections import deque
 
-log_buffer = []
+LOG_HISTORY_SIZE = 300  # lines replayed to a newly connected client
+BATCH_INTERVAL = 0.033  # seconds between server_log_batch emits (~30 Hz, the UI refresh rate)
+BATCH_MAX = 100         # lines per server_log_batch event
+
+# Circular history of raw (epoch second, msg); lines are formatted only when read or sent
+log_buffer = deque(maxlen=LOG_HISTORY_SIZE)
 socketio_instance = None
+_clients = 0  # connected browsers; with none, the consumer only records history
+
+# Each producing thread appends to its own deque; one consumer thread merges them
+# into log_buffer and emits, so callers never wait on SocketIO or on each other.
+_tls = threading.local()
+_producers = []                      # (thread, deque) per thread that has logged
+_producers_lock = threading.Lock()   # registration and client count; never per line
+_seq = itertools.count()             # global order for merging the per-thread deques
+_wake = threading.Event()
+_consumer = None
+
+_ts_cache = (None, "")  # (epoch second, "HH:MM:SS"); strftime runs at most once a second
 
 def set_socketio(sock):
-    global socketio_instance
+    global socketio_instance, _consumer
     socketio_instance = sock
+    if _consumer is None:
+        _consumer = threading.Thread(target=_emit_loop, daemon=True)
+        _consumer.start()
+
+def client_connected():
+    global _clients
+    with _producers_lock:
+        _clients += 1
+
+def client_disconnected():
+    global _clients
+    with _producers_lock:
+        _clients = max(0, _clients - 1)
+
+def _format(sec, msg):
+    global _ts_cache
+    cached = _ts_cache
+    if cached[0] != sec:
+        cached = _ts_cache = (sec, time.strftime("%H:%M:%S", time.localtime(sec)))
+    return f"[{cached[1]}] {msg}"
+
+def _local_deque():
+    q = getattr(_tls, "q", None)
+    if q is None:
+        q = _tls.q = deque()  # unbounded: the consumer empties it every pass, so no line is lost
+        with _producers_lock:
+            _producers.append((threading.current_thread(), q))
+    return q
+
+def _drain():
+    """Pop everything the producers have queued, merged back into logging order."""
+    batch = []
+    with _producers_lock:
+        producers = list(_producers)
+    for thread, q in producers:
+        while q:
+            batch.append(q.popleft())
+        if not thread.is_alive() and not q:
+            with _producers_lock:
+                _producers.remove((thread, q))
+    batch.sort(key=lambda item: item[0])
+    return batch
+
+def _emit_loop():
+    while True:
+        _wake.wait()
+        # Let a burst accumulate for one frame, then send it as one event per BATCH_MAX lines
+        time.sleep(BATCH_INTERVAL)
+        _wake.clear()  # anything logged after this re-arms the event for the next pass
+        batch = []
+        for _, sec, msg in _drain():
+            log_buffer.append((sec, msg))
+            if _clients:  # nobody to send to: skip formatting and the emit
+                batch.append(_format(sec, msg))
+        for i in range(0, len(batch), BATCH_MAX):
+            try:
+                socketio_instance.emit("server_log_batch", batch[i:i + BATCH_MAX])
+            except Exception as e:
+                print(f"[emit_log error] {e}")
 
 def emit_log(msg):
-    timestamp = datetime.now().strftime("%H:%M:%S")
-    full_msg = f"[{timestamp}] {msg}"
-    log_buffer.append(full_msg)
-    if len(log_buffer) > 300:
-        log_buffer.pop(0)
+    sec = int(time.time())
     if socketio_instance:
-        try:
-            socketio_instance.emit("server_log", full_msg)
-        except Exception as e:
-            print(f"[emit_log error] {e}")
+        _local_deque().append((next(_seq), sec, msg))
+        _wake.set()
     else:
-        print(f"[emit_log fallback] {full_msg}")
+        log_buffer.append((sec, msg))
+        print(f"[emit_log fallback] {_format(sec, msg)}")  # console is the only output here
 
 def get_log_history():
-    return log_buffer
\ No newline at end of file
+    """Formatted snapshot of the buffered lines; list(deque) is a single atomic copy
+    under the GIL, so callers can iterate it while other threads keep logging."""
+    return [_format(sec, msg) for sec, msg in list(log_buffer)]
@@ -1,17 +1,45 @@
 # Network Utilities
 # Suite of network utilities for remote SSH control and port checking
 
+import os
 import paramiko
+import select
 import socket
+import threading
 import time
-from utilities.config import RASPBERRY_PI_IP, SSH_USERNAME, SSH_PASSWORD
+from collections import deque
+from utilities.config import RASPBERRY_PI_IP, SSH_USERNAME, SSH_PASSWORD, SSH_KNOWN_HOSTS, SSH_KEY_FILE
+
+SSH_KEEPALIVE = 30  # seconds
+
+# Live SSH clients keyed on (ip, username); commands and streams open channels on them
+_ssh_pool = {}
+_pool_lock = threading.Lock()
+_pkey = None  # SSH_KEY_FILE, loaded once
+
+def _load_pkey():
+    global _pkey
+    if _pkey is None and SSH_KEY_FILE and os.path.exists(SSH_KEY_FILE):
+        _pkey = paramiko.Ed25519Key.from_private_key_file(SSH_KEY_FILE)
+    return _pkey
 
 def get_ssh_client(ip, username, password, retries=2):
     client = paramiko.SSHClient()
-    client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+    if os.path.exists(SSH_KNOWN_HOSTS):
+        client.load_host_keys(SSH_KNOWN_HOSTS)
+    # Trust on first use: record an unknown host once, then insist on the recorded key
+    known = client.get_host_keys().lookup(ip) is not None
+    client.set_missing_host_key_policy(paramiko.RejectPolicy() if known else paramiko.AutoAddPolicy())
+    pkey = _load_pkey()
     for attempt in range(retries):
         try:
-            client.connect(ip, username=username, password=password, timeout=5)
+            client.connect(ip, username=username, password=password, pkey=pkey, timeout=5,
+                           look_for_keys=False, allow_agent=False)
+            if not known:
+                try:
+                    client.save_host_keys(SSH_KNOWN_HOSTS)
+                except OSError:
+                    pass  # unwritable home: stay on trust-on-first-use next time
             return client
         except Exception as e:
             if attempt == retries - 1:
@@ -31,15 +59,27 @@ def stream_ssh_output(client, command, callback):
     channel = client.get_transport().open_session()
     channel.exec_command(command)
 
+    def emit_lines(pending, data, prefix=""):
+        # Keep a trailing partial line until the rest of it arrives
+        pending += data
+        *lines, rest = pending.split(b"\n")
+        for line in lines:
+            callback(prefix + line.decode(errors="replace").strip())
+        return rest
+
+    out, err = b"", b""
     while True:
+        # Sleep in select until the channel has data (or 100 ms pass) instead of spinning
+        select.select([channel], [], [], 0.1)
         if channel.recv_ready():
-            for line in channel.recv(1024).decode().splitlines():
-                callback(line.strip())
+            out = emit_lines(out, channel.recv(32768))
         if channel.recv_stderr_ready():
-            for line in channel.recv_stderr(1024).decode().splitlines():
-                callback(f"ERR: {line.strip()}")
-        if channel.exit_status_ready():
+            err = emit_lines(err, channel.recv_stderr(32768), "ERR: ")
+        if channel.exit_status_ready() and not channel.recv_ready() and not channel.recv_stderr_ready():
             break
+    for rest, prefix in ((out, ""), (err, "ERR: ")):
+        if rest.strip():
+            callback(prefix + rest.decode(errors="replace").strip())
 
 def check_remote_port(ip, port, timeout=2):
     """Check if a remote port is open (e.g., INDIGO on 7624)."""
@@ -52,21 +92,39 @@ def check_remote_port(ip, port, timeout=2):
 def run_ssh_command_with_log(client, command, log_callback):
     stdin, stdout, stderr = client.exec_command(command)
 
-    seen = set()
+    recent = deque(maxlen=64)  # drop repeats within a bounded window, not all history
     for line in stdout:
         line = line.strip()
-        if line and line not in seen:
+        if line and line not in recent:
             log_callback(f"[SSH] {line}")
-            seen.add(line)
+            recent.append(line)
 
     for line in stderr:
         log_callback(f"[SSH:ERR] {line.strip()}")
 
     return stdout.channel.recv_exit_status()
 
+def get_pooled_client(ip, username, password, reconnect=False):
+    """Return the pooled SSH client for (ip, username), (re)connecting if needed."""
+    key = (ip, username)
+    with _pool_lock:
+        client = _ssh_pool.get(key)
+        transport = client.get_transport() if client else None
+        if reconnect or transport is None or not transport.is_active():
+            if client:
+                client.close()
+            client = get_ssh_client(ip, username, password)
+            client.get_transport().set_keepalive(SSH_KEEPALIVE)
+            _ssh_pool[key] = client
+        return client
+
+def _get_pi_client(reconnect=False):
+    return get_pooled_client(RASPBERRY_PI_IP, SSH_USERNAME, SSH_PASSWORD, reconnect)
+
 def run_pi_ssh_command(command):
-    """Run a one-off SSH command on the Pi using stored config credentials."""
-    client = get_ssh_client(RASPBERRY_PI_IP, SSH_USERNAME, SSH_PASSWORD)
-    result = run_ssh_command(client, command)
-    client.close()
-    return result
\ No newline at end of file
+    """Run an SSH command on the Pi over the shared connection using stored config credentials."""
+    try:
+        return run_ssh_command(_get_pi_client(), command)
+    except (paramiko.SSHException, EOFError, OSError):
+        # Stale transport: reconnect once and retry
+        return run_ssh_command(_get_pi_client(reconnect=True), command)
\ No newline at end of file
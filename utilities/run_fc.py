@@ -1,27 +1,39 @@
 # Startup script to run FireCapture.
 
+import os
 import subprocess
+import threading
 import tkinter as tk
 
 def run_firecapture(output_box=None):
     """Run the FireCapture script and optionally display output in a GUI box."""
     # Add 755 permissions to the run_fc.sh script to make it executable if it is not already
-    subprocess.run(["chmod", "755", "./run_fc.sh"], check=True)
+    os.chmod("./run_fc.sh", 0o755)  # one syscall, no chmod process
 
-    # Run the FireCapture script
-    process = subprocess.Popen(["./run_fc.sh"], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-    stdout, stderr = process.communicate()
+    # Run the FireCapture script; output streams in as it is produced
+    process = subprocess.Popen(["./run_fc.sh"], stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                               text=True, bufsize=1)
+    _write(output_box, "Output of FireCapture:\n")
+    process.readers = [threading.Thread(target=_drain, args=(pipe, output_box, prefix), daemon=True)
+                       for pipe, prefix in ((process.stdout, ""), (process.stderr, "ERR: "))]
+    for reader in process.readers:
+        reader.start()
+    return process
 
-    # Print or display output
+def _write(output_box, text):
+    """Append text to the GUI box (on the Tk thread) or to stdout."""
     if output_box:
-        output_box.insert(tk.END, f"Output of FireCapture:\n{stdout}\n")
-        if stderr:
-            output_box.insert(tk.END, f"Errors:\n{stderr}\n")
-        output_box.see(tk.END)
+        output_box.after(0, lambda: (output_box.insert(tk.END, text), output_box.see(tk.END)))
     else:
-        print(f"Output of FireCapture:\n{stdout}")
-        if stderr:
-            print(f"Errors:\n{stderr}")
+        print(text, end="")
+
+def _drain(pipe, output_box, prefix):
+    with pipe:
+        for line in pipe:
+            _write(output_box, prefix + line)
 
 if __name__ == "__main__":
-    run_firecapture()
\ No newline at end of file
+    process = run_firecapture()
+    process.wait()
+    for reader in process.readers:
+        reader.join()
\ No newline at end of file
@@ -0,0 +1,78 @@
+# Solar Fast Module
+# Closed-form NOAA/ESRL solar position (the Meeus-based series behind the NOAA solar
+# calculator), vectorized over time. Good to about a hundredth of a degree, which is
+# plenty for pointing and plotting; PyEphem stays in charge of rise/set/transit.
+
+import numpy as np
+
+try:  # optional: JIT the trig kernel
+    from numba import njit
+except ImportError:
+    njit = None
+
+_DEG = np.pi / 180.0
+_TWO_PI = 2.0 * np.pi
+
+
+def _kernel(jd, utc_min, sin_lat, cos_lat, lon_deg):
+    T = (jd - 2451545.0) / 36525.0  # Julian centuries since J2000
+
+    # Geometric mean longitude/anomaly, orbit eccentricity, equation of center (degrees)
+    L0 = (280.46646 + T * (36000.76983 + 0.0003032 * T)) % 360.0
+    M = (357.52911 + T * (35999.05029 - 0.0001537 * T)) * _DEG
+    e = 0.016708634 - T * (0.000042037 + 0.0000001267 * T)
+    C = (np.sin(M) * (1.914602 - T * (0.004817 + 0.000014 * T))
+         + np.sin(2.0 * M) * (0.019993 - 0.000101 * T)
+         + np.sin(3.0 * M) * 0.000289)
+
+    # Apparent longitude and true obliquity (radians)
+    omega = (125.04 - 1934.136 * T) * _DEG
+    lam = (L0 + C - 0.00569 - 0.00478 * np.sin(omega)) * _DEG
+    eps0 = 23.0 + (26.0 + (21.448 - T * (46.815 + T * (0.00059 - T * 0.001813))) / 60.0) / 60.0
+    eps = (eps0 + 0.00256 * np.cos(omega)) * _DEG
+
+    sin_lam = np.sin(lam)
+    dec = np.arcsin(np.sin(eps) * sin_lam)
+    ra = np.arctan2(np.cos(eps) * sin_lam, np.cos(lam)) % _TWO_PI
+
+    # Equation of time (minutes) -> true solar time -> hour angle (0 at local solar noon)
+    y = np.tan(eps / 2.0) ** 2
+    L0r = L0 * _DEG
+    eqtime = 4.0 / _DEG * (y * np.sin(2.0 * L0r) - 2.0 * e * np.sin(M)
+                           + 4.0 * e * y * np.sin(M) * np.cos(2.0 * L0r)
+                           - 0.5 * y * y * np.sin(4.0 * L0r) - 1.25 * e * e * np.sin(2.0 * M))
+    tst = utc_min + eqtime + 4.0 * lon_deg
+    ha = (tst / 4.0 - 180.0) * _DEG
+
+    sin_dec = np.sin(dec)
+    cos_dec = np.cos(dec)
+    cos_ha = np.cos(ha)
+    alt = np.arcsin(sin_lat * sin_dec + cos_lat * cos_dec * cos_ha)
+    az = np.arctan2(-np.sin(ha) * cos_dec, cos_lat * sin_dec - sin_lat * cos_dec * cos_ha) % _TWO_PI
+    return alt, az, ra, dec
+
+
+if njit is not None:
+    _kernel = njit(cache=True)(_kernel)
+
+
+def refract(alt):
+    """Sæmundsson refraction: geometric -> apparent altitude (radians), applied above -1°."""
+    h = np.degrees(alt)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r_arcmin = 1.02 / np.tan(np.radians(h + 10.3 / (h + 5.11)))
+    return alt + np.where(h > -1.0, r_arcmin / 60.0 * _DEG, 0.0)
+
+
+def sun_position(t_unix, sin_lat, cos_lat, lon_deg, refraction=True):
+    """Sun (alt, az, ra, dec) in radians for unix time(s); arrays in, arrays out.
+    sin_lat/cos_lat are passed in so callers compute them once per site."""
+    t = np.asarray(t_unix, dtype=np.float64)
+    t1 = np.atleast_1d(t)
+    alt, az, ra, dec = _kernel(t1 / 86400.0 + 2440587.5, (t1 % 86400.0) / 60.0,
+                               float(sin_lat), float(cos_lat), float(lon_deg))
+    if refraction:
+        alt = refract(alt)
+    if t.ndim == 0:
+        return float(alt[0]), float(az[0]), float(ra[0]), float(dec[0])
+    return alt, az, ra, dec